@@ -5,7 +5,7 @@ Implements vector storage and similarity search using FAISS
 
 import faiss
 import numpy as np
-import json
+import orjson
 import aiofiles
 import asyncio
 from pathlib import Path
@@ -20,16 +20,25 @@ logger = logging.getLogger(__name__)
 class FAISSVectorStoreAdapter(VectorStoreAdapter):
     """FAISS-based implementation of vector storage"""
 
-    def __init__(self, data_dir: Path = Path("data/vectors"), dimension: int = 1536):
+    def __init__(
+        self,
+        data_dir: Path = Path("data/vectors"),
+        dimension: int = 1536,
+        use_fp16: bool = True
+    ):
         """
         Initialize FAISS vector store
 
         Args:
             data_dir: Directory for vector storage
-            dimension: Embedding dimension (1536 for text-embedding-3-small)
+            dimension: Embedding dimension; must match the embedder
+                (OpenAIAdapter.embedding_dimension, 1536 for text-embedding-3-small)
+            use_fp16: Store vectors as float16 (half the memory and index size;
+                L2 ranking on normalized embeddings is effectively unchanged)
         """
         self.data_dir = data_dir
         self.dimension = dimension
+        self.use_fp16 = use_fp16
         self.index_path = data_dir / "index.faiss"
         self.metadata_path = data_dir / "chunk_meta.jsonl"
 
@@ -37,7 +46,7 @@ class FAISSVectorStoreAdapter(VectorStoreAdapter):
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         # Initialize FAISS index (L2 distance)
-        self.index: Optional[faiss.IndexFlatL2] = None
+        self.index: Optional[faiss.Index] = None
         self.chunk_ids: List[str] = []
         self.metadata: Dict[str, Dict[str, Any]] = {}
 
@@ -47,12 +56,26 @@ class FAISSVectorStoreAdapter(VectorStoreAdapter):
         # Load existing index if available
         asyncio.create_task(self._initialize())
 
+    def _new_index(self) -> faiss.Index:
+        """
+        Create an empty L2 index in the configured storage precision
+
+        Returns:
+            Empty FAISS index
+        """
+        if self.use_fp16:
+            # Flat scan over float16 codes; needs no training
+            return faiss.IndexScalarQuantizer(
+                self.dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_L2
+            )
+        return faiss.IndexFlatL2(self.dimension)
+
     async def _initialize(self) -> None:
         """Initialize or load existing index"""
         if self.index_path.exists():
             await self.load_index(self.data_dir)
         else:
-            self.index = faiss.IndexFlatL2(self.dimension)
+            self.index = self._new_index()
             logger.info(f"Created new FAISS index with dimension {self.dimension}")
 
     async def add_embeddings(
@@ -75,7 +98,7 @@ class FAISSVectorStoreAdapter(VectorStoreAdapter):
         async with self._lock:
             # Ensure index is initialized
             if self.index is None:
-                self.index = faiss.IndexFlatL2(self.dimension)
+                self.index = self._new_index()
 
             # Convert embeddings to numpy array
             embeddings_array = np.array(embeddings, dtype=np.float32)
@@ -183,19 +206,23 @@ class FAISSVectorStoreAdapter(VectorStoreAdapter):
                 logger.warning("No index to save")
                 return
 
-            # Save FAISS index
+            # Save FAISS index off the event loop so concurrent requests
+            # aren't blocked on disk I/O
             index_file = path / "index.faiss"
-            faiss.write_index(self.index, str(index_file))
+            await asyncio.to_thread(faiss.write_index, self.index, str(index_file))
 
-            # Save metadata as JSONL
+            # Save metadata as JSONL in a single write (semantically equal to
+            # json.dumps output, though compact and with raw UTF-8)
             metadata_file = path / "chunk_meta.jsonl"
-            async with aiofiles.open(metadata_file, 'w') as f:
-                for chunk_id in self.chunk_ids:
-                    meta_entry = {
-                        "chunk_id": chunk_id,
-                        "metadata": self.metadata.get(chunk_id, {})
-                    }
-                    await f.write(json.dumps(meta_entry) + '\n')
+            lines = [
+                orjson.dumps({
+                    "chunk_id": chunk_id,
+                    "metadata": self.metadata.get(chunk_id, {})
+                }, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+                for chunk_id in self.chunk_ids
+            ]
+            async with aiofiles.open(metadata_file, 'wb') as f:
+                await f.write(b''.join(lines))
 
             logger.info(f"Saved FAISS index with {self.index.ntotal} vectors to {path}")
 
@@ -212,21 +239,37 @@ class FAISSVectorStoreAdapter(VectorStoreAdapter):
 
             if not index_file.exists():
                 logger.warning(f"Index file not found: {index_file}")
-                self.index = faiss.IndexFlatL2(self.dimension)
+                self.index = self._new_index()
                 return
 
             # Load FAISS index
-            self.index = faiss.read_index(str(index_file))
+            index = faiss.read_index(str(index_file))
+            if index.d != self.dimension:
+                # Vectors from a different embedding model can't be searched
+                # with this one's queries; start empty so re-indexing works.
+                # The stored vectors are dropped (and overwritten by the next
+                # save), so this is an error, not a routine warning.
+                logger.error(
+                    f"Stored index at {index_file} has dimension {index.d}, but the "
+                    f"embedding dimension is {self.dimension}; discarding its "
+                    f"{index.ntotal} vectors and starting a new index. Re-index all "
+                    f"documents, or restore the previous embedding model."
+                )
+                self.index = self._new_index()
+                self.chunk_ids = []
+                self.metadata = {}
+                return
+            self.index = index
 
             # Load metadata
             self.chunk_ids = []
             self.metadata = {}
 
             if metadata_file.exists():
-                async with aiofiles.open(metadata_file, 'r') as f:
+                async with aiofiles.open(metadata_file, 'rb') as f:
                     async for line in f:
                         if line.strip():
-                            entry = json.loads(line)
+                            entry = orjson.loads(line)
                             chunk_id = entry["chunk_id"]
                             self.chunk_ids.append(chunk_id)
                             self.metadata[chunk_id] = entry.get("metadata", {})
@@ -248,7 +291,7 @@ class FAISSVectorStoreAdapter(VectorStoreAdapter):
     async def clear_index(self) -> None:
         """Clear the entire index"""
         async with self._lock:
-            self.index = faiss.IndexFlatL2(self.dimension)
+            self.index = self._new_index()
             self.chunk_ids = []
             self.metadata = {}
             logger.info("Cleared FAISS index")
@@ -286,6 +329,6 @@ class FAISSVectorStoreAdapter(VectorStoreAdapter):
             return {
                 "total_vectors": self.index.ntotal if self.index else 0,
                 "dimension": self.dimension,
-                "index_type": "IndexFlatL2",
+                "index_type": type(self.index).__name__ if self.index is not None else None,
                 "unique_chunks": len(self.chunk_ids),
             }
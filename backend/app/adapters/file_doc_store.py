@@ -4,10 +4,12 @@ Implements document and chunk storage using JSON/JSONL files
 """
 
 import json
+import orjson
 import aiofiles
 import asyncio
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import logging
 
@@ -15,16 +17,25 @@ from app.adapters.base import DocStoreAdapter
 
 logger = logging.getLogger(__name__)
 
+# JSONL line options: newline-terminated, stringify non-str keys like json
+# does, and hand datetimes to default=str instead of orjson's RFC 3339 form
+_ORJSON_OPTS = (
+    orjson.OPT_APPEND_NEWLINE
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+)
+
 
 class FileDocStoreAdapter(DocStoreAdapter):
     """File-based implementation of document storage"""
 
-    def __init__(self, data_dir: Path = Path("data")):
+    def __init__(self, data_dir: Path = Path("data"), document_cache_size: int = 128):
         """
         Initialize file-based document store
 
         Args:
             data_dir: Root data directory
+            document_cache_size: Max deserialized documents kept in memory
         """
         self.data_dir = data_dir
         self.docs_dir = data_dir / "docs"
@@ -38,6 +49,11 @@ class FileDocStoreAdapter(DocStoreAdapter):
         # File locks for atomic writes
         self._locks: Dict[str, asyncio.Lock] = {}
 
+        # LRU of parsed documents by doc_id, tagged with the file's
+        # (mtime_ns, size), so repeated reads skip the disk read and JSON parse
+        self.document_cache_size = document_cache_size
+        self._document_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+
     def _get_lock(self, key: str) -> asyncio.Lock:
         """Get or create a lock for a specific key"""
         if key not in self._locks:
@@ -85,6 +101,8 @@ class FileDocStoreAdapter(DocStoreAdapter):
         logger.info(f"Saving document: {doc_id}")
 
         async with self._get_lock(f"doc_{doc_id}"):
+            self._document_cache.pop(doc_id, None)
+
             # Add timestamp
             document["saved_at"] = datetime.now().isoformat()
 
@@ -117,20 +135,38 @@ class FileDocStoreAdapter(DocStoreAdapter):
             doc_id: Unique document identifier
 
         Returns:
-            Document data or None if not found
+            Document data or None if not found. The dict is shared with the
+            document cache; copy it before mutating.
         """
         doc_path = self.docs_dir / f"{doc_id}.json"
 
-        if not doc_path.exists():
+        # Other store instances (each router and the orchestrator build their
+        # own) may rewrite or delete the file, so cached entries are only
+        # served while the file's mtime and size are unchanged
+        try:
+            stat = doc_path.stat()
+        except FileNotFoundError:
+            self._document_cache.pop(doc_id, None)
             logger.warning(f"Document not found: {doc_id}")
             return None
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._document_cache.get(doc_id)
+        if cached is not None and cached[0] == version:
+            self._document_cache.move_to_end(doc_id)
+            return cached[1]
 
         try:
             async with aiofiles.open(doc_path, 'r') as f:
                 content = await f.read()
                 document = json.loads(content)
                 logger.info(f"Document retrieved: {doc_id}")
-                return document
+
+            self._document_cache[doc_id] = (version, document)
+            self._document_cache.move_to_end(doc_id)
+            while len(self._document_cache) > self.document_cache_size:
+                self._document_cache.popitem(last=False)
+            return document
         except (json.JSONDecodeError, FileNotFoundError) as e:
             logger.error(f"Error loading document {doc_id}: {e}")
             return None
@@ -148,11 +184,20 @@ class FileDocStoreAdapter(DocStoreAdapter):
         async with self._get_lock(f"chunks_{doc_id}"):
             chunks_path = self.chunks_dir / f"{doc_id}.jsonl"
 
-            # Write chunks as JSONL (one JSON object per line)
-            async with aiofiles.open(chunks_path, 'w') as f:
-                for chunk in chunks:
-                    chunk["saved_at"] = datetime.now().isoformat()
-                    await f.write(json.dumps(chunk, default=str) + '\n')
+            # Write chunks as JSONL (one JSON object per line). All chunks in
+            # a batch share one timestamp and go out in a single write rather
+            # than one awaited write per chunk. orjson emits UTF-8 bytes
+            # directly; datetimes pass through to default=str so values parse
+            # back the same as json.dumps output. The bytes differ: separators
+            # are compact and non-ASCII text is raw UTF-8, not \u escapes.
+            saved_at = datetime.now().isoformat()
+            lines = []
+            for chunk in chunks:
+                chunk["saved_at"] = saved_at
+                lines.append(orjson.dumps(chunk, default=str, option=_ORJSON_OPTS))
+
+            async with aiofiles.open(chunks_path, 'wb') as f:
+                await f.write(b''.join(lines))
 
         logger.info(f"Chunks saved: {doc_id}")
 
@@ -177,18 +222,18 @@ class FileDocStoreAdapter(DocStoreAdapter):
             # Load chunks for specific document
             chunks_path = self.chunks_dir / f"{doc_id}.jsonl"
             if chunks_path.exists():
-                async with aiofiles.open(chunks_path, 'r') as f:
+                async with aiofiles.open(chunks_path, 'rb') as f:
                     async for line in f:
                         if line.strip():
-                            chunk = json.loads(line)
+                            chunk = orjson.loads(line)
                             chunks.append(chunk)
         else:
             # Load all chunks
             for chunks_file in self.chunks_dir.glob("*.jsonl"):
-                async with aiofiles.open(chunks_file, 'r') as f:
+                async with aiofiles.open(chunks_file, 'rb') as f:
                     async for line in f:
                         if line.strip():
-                            chunk = json.loads(line)
+                            chunk = orjson.loads(line)
                             chunks.append(chunk)
 
         # Apply filters if provided
@@ -265,6 +310,8 @@ class FileDocStoreAdapter(DocStoreAdapter):
             return False
 
         async with self._get_lock(f"doc_{doc_id}"):
+            self._document_cache.pop(doc_id, None)
+
             # Delete document file
             doc_path.unlink(missing_ok=True)
 
@@ -0,0 +1,94 @@
+"""
+Local embedding model served with ONNX Runtime
+Runs an encoder (e.g. bge-small) on the GPU instead of calling a remote API
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LocalEmbedder:
+    """Batch sentence embeddings from an exported ONNX encoder"""
+
+    def __init__(
+        self,
+        model_path: Path,
+        tokenizer_path: Optional[Path] = None,
+        max_length: int = 512,
+        providers: Sequence[str] = ("CUDAExecutionProvider", "CPUExecutionProvider")
+    ):
+        """
+        Initialize the ONNX Runtime session and tokenizer
+
+        Args:
+            model_path: Path to the exported ONNX model
+            tokenizer_path: Path to the HuggingFace tokenizer.json
+                (defaults to tokenizer.json next to the model)
+            max_length: Max tokens per text; longer texts are truncated
+            providers: Execution providers in priority order; CPU is kept as
+                a fallback so the embedder still loads on hosts without CUDA
+        """
+        # Optional dependencies, only needed when local embeddings are enabled
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "Local embeddings require the onnxruntime-gpu and tokenizers packages"
+            ) from e
+
+        model_path = Path(model_path)
+        tokenizer_path = Path(tokenizer_path or model_path.parent / "tokenizer.json")
+
+        self.model_name = model_path.stem
+        self.session = ort.InferenceSession(str(model_path), providers=list(providers))
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        # The Rust tokenizer pads each batch only to its own longest text
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        # Output width, which the vector store index must be built with.
+        # Exports often leave the hidden size symbolic, so probe if needed.
+        hidden_size = self.session.get_outputs()[0].shape[-1]
+        self.dimension = (
+            hidden_size if isinstance(hidden_size, int) else self.embed(["dimension probe"]).shape[1]
+        )
+
+        logger.info(
+            f"Initialized local embedder {self.model_name} ({self.dimension}-dim) "
+            f"on {self.session.get_providers()[0]}"
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts (blocking; run off the event loop)
+
+        Args:
+            texts: Texts for one forward pass
+
+        Returns:
+            float32 array of L2-normalized embeddings, one row per text
+        """
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        # BERT-style exports also declare token_type_ids
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        last_hidden_state = self.session.run(None, feeds)[0]
+
+        # Mean-pool over real tokens only, then L2-normalize
+        mask = attention_mask[:, :, None].astype(np.float32)
+        summed = (last_hidden_state * mask).sum(axis=1)
+        pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
@@ -5,7 +5,11 @@ Implements LLM operations using OpenAI API
 
 import os
 import json
+import asyncio
+import hashlib
 import logging
+from collections import OrderedDict
+from pathlib import Path
 from typing import List, Optional, Dict, Any
 from openai import AsyncOpenAI
 import tiktoken
@@ -17,9 +21,19 @@ from tenacity import (
 )
 
 from app.adapters.base import LLMAdapter
+from app.adapters.local_embedder import LocalEmbedder
 
 logger = logging.getLogger(__name__)
 
+# Output dimension of each OpenAI embedding model
+_EMBEDDING_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+# Assumed for models missing from the table (the vector store's old default)
+_DEFAULT_EMBEDDING_DIMENSION = 1536
+
 
 class OpenAIAdapter(LLMAdapter):
     """OpenAI-based implementation of LLM operations"""
@@ -28,7 +42,11 @@ class OpenAIAdapter(LLMAdapter):
         self,
         api_key: Optional[str] = None,
         model: str = "gpt-3.5-turbo",
-        embedding_model: str = "text-embedding-3-small"
+        embedding_model: str = "text-embedding-3-small",
+        embedding_batch_size: int = 256,
+        embedding_cache_size: int = 10000,
+        embedding_max_concurrency: int = 4,
+        local_embedding_model_path: Optional[str] = None
     ):
         """
         Initialize OpenAI adapter
@@ -37,6 +55,12 @@ class OpenAIAdapter(LLMAdapter):
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: Model name for generation
             embedding_model: Model name for embeddings
+            embedding_batch_size: Max texts per embeddings request
+            embedding_cache_size: Max embeddings kept in the content-hash cache
+            embedding_max_concurrency: Max embeddings requests in flight at once
+            local_embedding_model_path: ONNX encoder to embed with locally
+                instead of the embeddings API (defaults to the
+                LOCAL_EMBEDDING_MODEL_PATH env var; unset uses the API)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -44,8 +68,27 @@ class OpenAIAdapter(LLMAdapter):
 
         self.model = model
         self.embedding_model = embedding_model
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_cache_size = embedding_cache_size
+        self.embedding_max_concurrency = embedding_max_concurrency
+        # LRU of embeddings keyed by SHA-256 of (model, normalized text)
+        self._embedding_cache: "OrderedDict[bytes, List[float]]" = OrderedDict()
         self.client = AsyncOpenAI(api_key=self.api_key)
 
+        # Local GPU embeddings. Vector stores are built with
+        # embedding_dimension, so switching models requires re-indexing.
+        local_embedding_model_path = (
+            local_embedding_model_path or os.getenv("LOCAL_EMBEDDING_MODEL_PATH")
+        )
+        self.local_embedder: Optional[LocalEmbedder] = None
+        if local_embedding_model_path:
+            self.local_embedder = LocalEmbedder(
+                Path(local_embedding_model_path),
+                tokenizer_path=os.getenv("LOCAL_EMBEDDING_TOKENIZER_PATH")
+            )
+            # Keeps cache keys distinct from API embeddings
+            self.embedding_model = f"local:{self.local_embedder.model_name}"
+
         # Initialize tokenizer
         try:
             self.encoding = tiktoken.encoding_for_model(model)
@@ -60,6 +103,20 @@ class OpenAIAdapter(LLMAdapter):
 
         logger.info(f"Initialized OpenAI adapter with model: {model}")
 
+    @property
+    def embedding_dimension(self) -> int:
+        """Dimension of the vectors returned by embed"""
+        if self.local_embedder is not None:
+            return self.local_embedder.dimension
+        dimension = _EMBEDDING_DIMENSIONS.get(self.embedding_model)
+        if dimension is None:
+            dimension = _DEFAULT_EMBEDDING_DIMENSION
+            logger.warning(
+                f"Unknown embedding model {self.embedding_model}; "
+                f"assuming {dimension}-dim vectors"
+            )
+        return dimension
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -137,15 +194,9 @@ class OpenAIAdapter(LLMAdapter):
             logger.error(f"Error in generation: {e}")
             raise
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((Exception,)),
-        reraise=True
-    )
     async def embed(self, texts: List[str]) -> List[List[float]]:
         """
-        Generate embeddings for texts with retry logic
+        Generate embeddings for texts in batched requests
 
         Args:
             texts: List of text strings
@@ -153,29 +204,123 @@ class OpenAIAdapter(LLMAdapter):
         Returns:
             List of embedding vectors
         """
+        keys = [self._embedding_key(text) for text in texts]
+
+        # Serve repeated and previously seen texts from the cache; only
+        # unique misses are sent to the API
+        found: Dict[bytes, List[float]] = {}
+        misses: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in misses:
+                continue
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                self._embedding_cache.move_to_end(key)
+                found[key] = cached
+            else:
+                misses[key] = text
+
+        if len(found) < len(texts):
+            logger.debug(
+                f"Embedding cache: {len(found)} hits, {len(misses)} unique misses "
+                f"for {len(texts)} texts"
+            )
+
+        # One request per batch; retries apply per batch so a transient
+        # failure doesn't re-embed batches that already succeeded. Batches
+        # run concurrently (bounded) so their round trips overlap.
+        miss_items = list(misses.items())
+        batches = [
+            miss_items[i:i + self.embedding_batch_size]
+            for i in range(0, len(miss_items), self.embedding_batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.embedding_max_concurrency)
+
+        async def embed_batch(batch: List[tuple]) -> None:
+            async with semaphore:
+                vectors = await self._embed_batch([text for _, text in batch])
+            # Cache as each batch lands, so a later batch failing doesn't
+            # discard vectors already paid for
+            for (key, _), vector in zip(batch, vectors):
+                found[key] = vector
+                self._cache_embedding(key, vector)
+
+        # TaskGroup cancels the batches still waiting or in flight as soon as
+        # one fails, rather than letting them run on unobserved
         try:
-            # OpenAI API has a limit on batch size, chunk if necessary
-            batch_size = 100
-            all_embeddings = []
+            async with asyncio.TaskGroup() as tg:
+                for batch in batches:
+                    tg.create_task(embed_batch(batch))
+        except ExceptionGroup as eg:
+            # Callers handle the batch's own error, not the group wrapper
+            raise eg.exceptions[0]
 
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
+        return [found[key] for key in keys]
 
-                response = await self.client.embeddings.create(
-                    model=self.embedding_model,
-                    input=batch
-                )
+    def _embedding_key(self, text: str) -> bytes:
+        """
+        Build the embedding cache key for a text
 
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
+        Whitespace is collapsed so trivially reflowed text (e.g. the same
+        clause extracted with different line breaks) shares an entry.
 
-                # Calculate cost
-                total_tokens = response.usage.total_tokens if response.usage else 0
-                cost = (total_tokens / 1000) * self.embedding_cost_per_1k
+        Args:
+            text: Input text
 
-                logger.info(f"Generated {len(batch)} embeddings: {total_tokens} tokens, ${cost:.6f}")
+        Returns:
+            SHA-256 digest of the model name and normalized text
+        """
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{self.embedding_model}\0{normalized}".encode()).digest()
 
-            return all_embeddings
+    def _cache_embedding(self, key: bytes, vector: List[float]) -> None:
+        """
+        Store an embedding, evicting the least recently used past the cap
+
+        Args:
+            key: Cache key from _embedding_key
+            vector: Embedding vector
+        """
+        self._embedding_cache[key] = vector
+        self._embedding_cache.move_to_end(key)
+        while len(self._embedding_cache) > self.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((Exception,)),
+        reraise=True
+    )
+    async def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """
+        Embed a single batch with retry logic
+
+        Args:
+            batch: Texts for one embeddings request
+
+        Returns:
+            Embedding vectors for the batch
+        """
+        if self.local_embedder is not None:
+            # The forward pass blocks, so run it off the event loop
+            vectors = await asyncio.to_thread(self.local_embedder.embed, batch)
+            logger.info(f"Generated {len(batch)} embeddings locally")
+            return vectors.tolist()
+
+        try:
+            response = await self.client.embeddings.create(
+                model=self.embedding_model,
+                input=batch
+            )
+
+            # Calculate cost
+            total_tokens = response.usage.total_tokens if response.usage else 0
+            cost = (total_tokens / 1000) * self.embedding_cost_per_1k
+
+            logger.info(f"Generated {len(batch)} embeddings: {total_tokens} tokens, ${cost:.6f}")
+
+            return [item.embedding for item in response.data]
 
         except Exception as e:
             logger.error(f"Error in embedding: {e}")
@@ -294,3 +439,21 @@ Extract all relevant entities and their relationships."""
             input_cost = (input_tokens / 1000) * self.cost_per_1k_input
             output_cost = (output_tokens / 1000) * self.cost_per_1k_output
             return input_cost + output_cost
+
+
+# Global adapter instance, shared so the API client and any local embedding
+# session are created once per process
+_llm_adapter: Optional[OpenAIAdapter] = None
+
+
+def get_llm_adapter() -> OpenAIAdapter:
+    """
+    Get the global OpenAI adapter instance
+
+    Returns:
+        OpenAIAdapter instance
+    """
+    global _llm_adapter
+    if _llm_adapter is None:
+        _llm_adapter = OpenAIAdapter()
+    return _llm_adapter
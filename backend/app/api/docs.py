@@ -246,7 +246,10 @@ async def get_storage_stats():
 
         # Vector store stats
         from app.adapters.faiss_vector_store import FAISSVectorStoreAdapter
-        vector_store = FAISSVectorStoreAdapter(data_dir / "vectors")
+        from app.adapters.openai_adapter import get_llm_adapter
+        vector_store = FAISSVectorStoreAdapter(
+            data_dir / "vectors", dimension=get_llm_adapter().embedding_dimension
+        )
         await vector_store.load_index(data_dir / "vectors")
         vector_stats = await vector_store.get_stats()
 
@@ -418,13 +421,13 @@ async def rebuild_graph(
 
     try:
         from app.adapters.networkx_graph_store import NetworkXGraphStoreAdapter
-        from app.adapters.openai_adapter import OpenAIAdapter
+        from app.adapters.openai_adapter import get_llm_adapter
         from app.modules.graph_extraction import GraphExtractionModule
         from app.core.config_loader import get_config_loader
 
         # Initialize components
         graph_store = NetworkXGraphStoreAdapter(data_dir / "graph")
-        llm = OpenAIAdapter()
+        llm = get_llm_adapter()
         config_loader = get_config_loader()
 
         # Load profile
@@ -5,6 +5,7 @@ Handles PDF upload and document indexing
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from pathlib import Path
+import asyncio
 import logging
 import uuid
 import shutil
@@ -13,7 +14,7 @@ from app.core.models import IngestPDFResponse, IndexDocumentResponse
 from app.adapters.file_doc_store import FileDocStoreAdapter
 from app.adapters.faiss_vector_store import FAISSVectorStoreAdapter
 from app.adapters.networkx_graph_store import NetworkXGraphStoreAdapter
-from app.adapters.openai_adapter import OpenAIAdapter
+from app.adapters.openai_adapter import get_llm_adapter
 from app.modules.pdf_ingestion import PDFIngestionModule
 from app.modules.chunking import ChunkingModule
 from app.modules.graph_extraction import GraphExtractionModule
@@ -26,9 +27,9 @@ router = APIRouter()
 config_loader = get_config_loader()
 data_dir = Path("data")
 doc_store = FileDocStoreAdapter(data_dir)
-vector_store = FAISSVectorStoreAdapter(data_dir / "vectors")
+llm = get_llm_adapter()
+vector_store = FAISSVectorStoreAdapter(data_dir / "vectors", dimension=llm.embedding_dimension)
 graph_store = NetworkXGraphStoreAdapter(data_dir / "graph")
-llm = OpenAIAdapter()
 
 pdf_ingestion = PDFIngestionModule()
 chunking = ChunkingModule()
@@ -144,18 +145,24 @@ async def index_document(
         chunks_data = [chunk.model_dump() for chunk in chunks]
         await doc_store.save_chunks(doc_id, chunks_data)
 
-        # Step 2: Generate embeddings
-        chunk_texts = [chunk.text for chunk in chunks]
-        embeddings = await llm.embed(chunk_texts)
-        chunk_ids = [chunk.chunk_id for chunk in chunks]
-        chunk_metadata = [chunk.metadata for chunk in chunks]
+        # Steps 2 and 3 are independent LLM-bound work, so run them concurrently
+        async def embed_chunks():
+            # Step 2: Generate embeddings
+            chunk_texts = [chunk.text for chunk in chunks]
+            embeddings = await llm.embed(chunk_texts)
+            chunk_ids = [chunk.chunk_id for chunk in chunks]
+            chunk_metadata = [chunk.metadata for chunk in chunks]
 
-        await vector_store.add_embeddings(chunk_ids, embeddings, chunk_metadata)
-        await vector_store.save_index(data_dir / "vectors")
+            await vector_store.add_embeddings(chunk_ids, embeddings, chunk_metadata)
+            await vector_store.save_index(data_dir / "vectors")
+            return embeddings
 
         # Step 3: Extract graph entities with domain-specific profile
         graph_extractor = GraphExtractionModule(llm, profile=graph_extraction_profile)
-        graph_data = await graph_extractor.extract_from_chunks(chunks_data)
+        embeddings, graph_data = await asyncio.gather(
+            embed_chunks(),
+            graph_extractor.extract_from_chunks(chunks_data)
+        )
         if graph_data["nodes"]:
             await graph_store.add_nodes(graph_data["nodes"])
         if graph_data["edges"]:
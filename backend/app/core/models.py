@@ -3,7 +3,7 @@ Pydantic domain models for RAGMesh
 Strict data validation for all entities in the system
 """
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
@@ -154,7 +154,9 @@ class RetrievalBundle(BaseModel):
 # ============================================================================
 
 class Citation(BaseModel):
-    """Citation with provenance"""
+    """Citation with provenance (immutable once created, so safe to share)"""
+    model_config = ConfigDict(frozen=True)
+
     chunk_id: str = Field(..., description="Chunk identifier")
     doc_id: str = Field(..., description="Document identifier")
     page_no: int = Field(..., ge=1, description="Page number")
@@ -340,6 +342,16 @@ class ChunkingProfile(BaseModel):
     min_chunk_size: int = Field(default=100, ge=10, le=1000)
     preserve_paragraph_boundaries: bool = Field(default=True)
 
+    @model_validator(mode="after")
+    def _check_overlap(self) -> "ChunkingProfile":
+        """Each chunk must advance past the previous one"""
+        if self.chunk_overlap >= self.chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({self.chunk_overlap}) must be less than "
+                f"chunk_size ({self.chunk_size})"
+            )
+        return self
+
 
 class GraphExtractionProfile(BaseModel):
     """Graph extraction configuration for entity and relationship extraction"""
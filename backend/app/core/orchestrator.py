@@ -20,7 +20,7 @@ from app.core.chat_manager import ChatSessionManager
 from app.adapters.file_doc_store import FileDocStoreAdapter
 from app.adapters.faiss_vector_store import FAISSVectorStoreAdapter
 from app.adapters.networkx_graph_store import NetworkXGraphStoreAdapter
-from app.adapters.openai_adapter import OpenAIAdapter
+from app.adapters.openai_adapter import get_llm_adapter
 from app.modules.vector_retrieval import VectorRetrievalModule
 from app.modules.doc_retrieval import DocumentRetrievalModule
 from app.modules.graph_retrieval import GraphRetrievalModule
@@ -48,9 +48,11 @@ class RunOrchestrator:
 
         # Initialize adapters
         self.doc_store = FileDocStoreAdapter(data_dir)
-        self.vector_store = FAISSVectorStoreAdapter(data_dir / "vectors")
+        self.llm = get_llm_adapter()
+        self.vector_store = FAISSVectorStoreAdapter(
+            data_dir / "vectors", dimension=self.llm.embedding_dimension
+        )
         self.graph_store = NetworkXGraphStoreAdapter(data_dir / "graph")
-        self.llm = OpenAIAdapter()
 
         # Initialize modules
         self.vector_retrieval = VectorRetrievalModule(self.vector_store, self.llm)
@@ -43,7 +43,10 @@ async def lifespan(app: FastAPI):
     # Initialize vector store index (if exists)
     try:
         from app.adapters.faiss_vector_store import FAISSVectorStoreAdapter
-        vector_store = FAISSVectorStoreAdapter(Path("data/vectors"))
+        from app.adapters.openai_adapter import get_llm_adapter
+        vector_store = FAISSVectorStoreAdapter(
+            Path("data/vectors"), dimension=get_llm_adapter().embedding_dimension
+        )
         await vector_store.load_index(Path("data/vectors"))
         logger.info(f"Vector index loaded: {await vector_store.get_index_size()} vectors")
     except Exception as e:
@@ -65,6 +68,9 @@ async def lifespan(app: FastAPI):
 
     logger.info("Shutting down RAGMesh API...")
 
+    from app.modules.chunking import shutdown_chunking_pool
+    shutdown_chunking_pool()
+
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -3,16 +3,31 @@ Chunking module
 Creates chunks from documents with page-aware and sentence-aware strategies
 """
 
+import asyncio
+import gc
 import logging
+import multiprocessing
+import os
 import re
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 import tiktoken
-import uuid
 
 from app.core.models import Document, Chunk, ChunkingProfile
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundary: whitespace after ., ! or ? that precedes a capital letter.
+# The possessive \s++ never gives whitespace back, so a long run that isn't
+# followed by a capital fails in one pass instead of backtracking through it.
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s++(?=[A-Z])')
+
+# Chunking is CPU-bound; chunk_document runs it in worker processes so it
+# neither blocks the event loop nor serializes concurrent callers on the GIL
+_CHUNKING_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_chunking_pool: Optional[ProcessPoolExecutor] = None
+
 
 class ChunkingModule:
     """Handles document chunking with various strategies"""
@@ -36,7 +51,34 @@ class ChunkingModule:
         profile: ChunkingProfile
     ) -> List[Chunk]:
         """
-        Chunk a document according to the profile
+        Chunk a document according to the profile in a worker process
+
+        The pool spawns its workers, and each one re-imports the calling
+        script's __main__ module. A standalone script that calls this must
+        keep its entry point under an ``if __name__ == "__main__":`` guard;
+        otherwise every worker re-runs the script. Serving app.main through
+        the uvicorn CLI is unaffected, since uvicorn guards its own entry point.
+
+        Args:
+            document: Document to chunk
+            profile: Chunking profile with strategy
+
+        Returns:
+            List of chunks
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_chunking_pool(), chunk_document_in_worker,
+            document, profile, self.encoding.name
+        )
+
+    def chunk_document_sync(
+        self,
+        document: Document,
+        profile: ChunkingProfile
+    ) -> List[Chunk]:
+        """
+        Chunk a document according to the profile (blocking, CPU-bound)
 
         Args:
             document: Document to chunk
@@ -52,7 +94,7 @@ class ChunkingModule:
         if profile.page_aware:
             # Process each page separately
             for page in document.pages:
-                page_chunks = await self._chunk_text(
+                page_chunks = self._chunk_text(
                     text=page.text,
                     page_no=page.page_no,
                     doc_id=document.doc_id,
@@ -65,7 +107,7 @@ class ChunkingModule:
         else:
             # Combine all pages and chunk
             combined_text = " ".join([page.text for page in document.pages])
-            chunks = await self._chunk_text(
+            chunks = self._chunk_text(
                 text=combined_text,
                 page_no=1,  # Default to page 1 if not page-aware
                 doc_id=document.doc_id,
@@ -85,7 +127,7 @@ class ChunkingModule:
         logger.info(f"Created {len(chunks)} chunks for document {document.doc_id}")
         return chunks
 
-    async def _chunk_text(
+    def _chunk_text(
         self,
         text: str,
         page_no: int,
@@ -113,31 +155,28 @@ class ChunkingModule:
         if not text.strip():
             return []
 
-        chunks = []
-
         if sentence_aware:
             # Split by sentences first
             sentences = self._split_sentences(text)
-            chunks = self._chunk_by_sentences(
+            spans = self._chunk_by_sentences(
                 sentences=sentences,
-                page_no=page_no,
-                doc_id=doc_id,
                 chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                metadata=metadata
+                chunk_overlap=chunk_overlap
             )
         else:
             # Simple character-based chunking
-            chunks = self._chunk_by_characters(
+            spans = self._chunk_by_characters(
                 text=text,
-                page_no=page_no,
-                doc_id=doc_id,
                 chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                metadata=metadata
+                chunk_overlap=chunk_overlap
             )
 
-        return chunks
+        return self._create_chunks(
+            spans=spans,
+            page_no=page_no,
+            doc_id=doc_id,
+            metadata=metadata
+        )
 
     def _split_sentences(self, text: str) -> List[str]:
         """
@@ -151,8 +190,7 @@ class ChunkingModule:
         """
         # Simple sentence splitter (can be enhanced with spaCy/NLTK)
         # Split on period, exclamation, question mark followed by space or newline
-        sentence_pattern = r'(?<=[.!?])\s+(?=[A-Z])'
-        sentences = re.split(sentence_pattern, text)
+        sentences = _SENTENCE_BOUNDARY_RE.split(text)
 
         # Clean up sentences
         sentences = [s.strip() for s in sentences if s.strip()]
@@ -162,142 +200,150 @@ class ChunkingModule:
     def _chunk_by_sentences(
         self,
         sentences: List[str],
-        page_no: int,
-        doc_id: str,
         chunk_size: int,
-        chunk_overlap: int,
-        metadata: Dict[str, Any]
-    ) -> List[Chunk]:
+        chunk_overlap: int
+    ) -> List[Tuple[str, int]]:
         """
-        Create chunks by grouping sentences
+        Group sentences into chunk spans
 
         Args:
             sentences: List of sentences
-            page_no: Page number
-            doc_id: Document ID
             chunk_size: Target chunk size in characters
             chunk_overlap: Overlap size in characters
-            metadata: Document metadata
 
         Returns:
-            List of chunks
+            List of (chunk text, char start) spans
         """
-        chunks = []
-        current_chunk_text = ""
+        spans = []
         char_start = 0
 
+        # Collect sentences and track the joined length instead of growing a
+        # string, so each chunk's text is built once with a single join
+        current_parts: List[str] = []
+        current_length = 0
+
         for sentence in sentences:
             # Check if adding this sentence exceeds chunk size
-            if current_chunk_text and len(current_chunk_text) + len(sentence) > chunk_size:
-                # Create chunk
-                chunk = self._create_chunk(
-                    text=current_chunk_text,
-                    char_start=char_start,
-                    page_no=page_no,
-                    doc_id=doc_id,
-                    metadata=metadata
-                )
-                chunks.append(chunk)
+            if current_parts and current_length + len(sentence) > chunk_size:
+                current_chunk_text = " ".join(current_parts)
+                spans.append((current_chunk_text, char_start))
 
                 # Start new chunk with overlap
                 overlap_text = self._get_overlap_text(current_chunk_text, chunk_overlap)
                 char_start = char_start + len(current_chunk_text) - len(overlap_text)
-                current_chunk_text = overlap_text + " " + sentence
+                current_parts = [overlap_text, sentence]
+                current_length = len(overlap_text) + 1 + len(sentence)
             else:
                 # Add sentence to current chunk
-                if current_chunk_text:
-                    current_chunk_text += " " + sentence
+                if current_parts:
+                    current_length += 1 + len(sentence)
                 else:
-                    current_chunk_text = sentence
+                    current_length = len(sentence)
+                current_parts.append(sentence)
 
         # Add final chunk if any text remains
+        current_chunk_text = " ".join(current_parts)
         if current_chunk_text.strip():
-            chunk = self._create_chunk(
-                text=current_chunk_text,
-                char_start=char_start,
-                page_no=page_no,
-                doc_id=doc_id,
-                metadata=metadata
-            )
-            chunks.append(chunk)
+            spans.append((current_chunk_text, char_start))
 
-        return chunks
+        return spans
 
     def _chunk_by_characters(
         self,
         text: str,
+        chunk_size: int,
+        chunk_overlap: int
+    ) -> List[Tuple[str, int]]:
+        """
+        Split text into chunk spans by character count
+
+        Args:
+            text: Text to chunk
+            chunk_size: Chunk size in characters
+            chunk_overlap: Overlap size in characters
+
+        Returns:
+            List of (chunk text, char start) spans
+
+        Raises:
+            ValueError: If chunk_overlap is not less than chunk_size
+        """
+        # Each chunk starts chunk_size - chunk_overlap after the previous one.
+        # ChunkingProfile rejects overlap >= size; direct callers get the same
+        # error rather than one chunk per character.
+        step = chunk_size - chunk_overlap
+        if step <= 0:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) must be less than chunk_size ({chunk_size})"
+            )
+        starts = np.arange(0, len(text), step, dtype=np.int64).tolist()
+
+        return [(text[start:start + chunk_size], start) for start in starts]
+
+    def _create_chunks(
+        self,
+        spans: List[Tuple[str, int]],
         page_no: int,
         doc_id: str,
-        chunk_size: int,
-        chunk_overlap: int,
         metadata: Dict[str, Any]
     ) -> List[Chunk]:
         """
-        Create chunks by character count
+        Create Chunk objects for a page's spans
 
         Args:
-            text: Text to chunk
+            spans: List of (chunk text, char start) spans
             page_no: Page number
             doc_id: Document ID
-            chunk_size: Chunk size in characters
-            chunk_overlap: Overlap size in characters
             metadata: Document metadata
 
         Returns:
             List of chunks
         """
-        chunks = []
-        text_length = len(text)
-        start = 0
+        token_counts = self._count_tokens_batch([text for text, _ in spans])
 
-        while start < text_length:
-            # Calculate end position
-            end = start + chunk_size
+        # Random 8-hex-char id suffixes for the whole page from one urandom
+        # read, instead of a uuid4() (and urandom call) per chunk
+        id_prefix = f"{doc_id}_p{page_no}_c"
+        suffixes = os.urandom(4 * len(spans)).hex()
 
-            # Extract chunk text
-            chunk_text = text[start:end]
-
-            # Create chunk
-            chunk = self._create_chunk(
-                text=chunk_text,
-                char_start=start,
+        return [
+            self._create_chunk(
+                chunk_id=id_prefix + suffixes[8 * i:8 * i + 8],
+                text=text,
+                char_start=char_start,
                 page_no=page_no,
                 doc_id=doc_id,
-                metadata=metadata
+                metadata=metadata,
+                tokens=tokens
             )
-            chunks.append(chunk)
-
-            # Move start position with overlap
-            start = end - chunk_overlap
-
-        return chunks
+            for i, ((text, char_start), tokens) in enumerate(zip(spans, token_counts))
+        ]
 
     def _create_chunk(
         self,
+        chunk_id: str,
         text: str,
         char_start: int,
         page_no: int,
         doc_id: str,
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        tokens: int
     ) -> Chunk:
         """
         Create a Chunk object
 
         Args:
+            chunk_id: Chunk identifier
             text: Chunk text
             char_start: Character start position in page
             page_no: Page number
             doc_id: Document ID
             metadata: Document metadata
+            tokens: Token count for the chunk text
 
         Returns:
             Chunk object
         """
-        chunk_id = f"{doc_id}_p{page_no}_c{uuid.uuid4().hex[:8]}"
-
-        # Count tokens
-        tokens = self._count_tokens(text)
-
         # Create chunk metadata
         chunk_metadata = {
             "doc_type": metadata.get("doc_type"),
@@ -334,20 +380,82 @@ class ChunkingModule:
 
         return text[-overlap_size:]
 
-    def _count_tokens(self, text: str) -> int:
+    def _count_tokens_batch(self, texts: List[str]) -> List[int]:
         """
-        Count tokens in text
+        Count tokens for several texts
 
         Args:
-            text: Input text
+            texts: Input texts
 
         Returns:
-            Number of tokens
+            Number of tokens per text
         """
         try:
-            tokens = self.encoding.encode(text)
-            return len(tokens)
+            # encode_ordinary_batch starts a new thread pool per call, which
+            # costs more than it saves on a page's worth of chunks
+            return [len(self.encoding.encode_ordinary(text)) for text in texts]
         except Exception as e:
             logger.error(f"Error counting tokens: {e}")
             # Fallback: rough estimate (1 token ≈ 4 characters)
-            return len(text) // 4
+            return [len(text) // 4 for text in texts]
+
+
+def _get_chunking_pool() -> ProcessPoolExecutor:
+    """Create the chunking process pool on first use"""
+    global _chunking_pool
+    if _chunking_pool is None:
+        # Spawned workers: forking the multithreaded server process could
+        # copy locks held by other threads into the child. Spawn re-imports
+        # __main__ in each worker, so scripts calling chunk_document need an
+        # `if __name__ == "__main__":` guard (see chunk_document)
+        _chunking_pool = ProcessPoolExecutor(
+            max_workers=_CHUNKING_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _chunking_pool
+
+
+def shutdown_chunking_pool() -> None:
+    """Shut down the chunking process pool if it was started"""
+    global _chunking_pool
+    if _chunking_pool is not None:
+        _chunking_pool.shutdown(wait=False, cancel_futures=True)
+        _chunking_pool = None
+
+
+# Per-process chunkers by encoding name; built on first use so the tiktoken
+# encoding is loaded once per worker rather than pickled with every task
+_worker_chunkers: Dict[str, ChunkingModule] = {}
+
+
+def chunk_document_in_worker(
+    document: Document,
+    profile: ChunkingProfile,
+    encoding_name: str = "cl100k_base"
+) -> List[Chunk]:
+    """
+    Chunk a document inside a worker process
+
+    Args:
+        document: Document to chunk
+        profile: Chunking profile with strategy
+        encoding_name: Tiktoken encoding name for token counting
+
+    Returns:
+        List of chunks
+    """
+    chunker = _worker_chunkers.get(encoding_name)
+    if chunker is None:
+        chunker = _worker_chunkers[encoding_name] = ChunkingModule(encoding_name)
+
+    # A document allocates thousands of acyclic Chunk objects (plus their
+    # metadata dicts) that refcounting frees, so the cyclic collector's gen-0
+    # passes are pure overhead here. The worker runs one task at a time, so
+    # pausing it for the task can't affect anything else in the process.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return chunker.chunk_document_sync(document, profile)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
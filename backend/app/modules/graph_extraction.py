@@ -3,6 +3,7 @@ Graph extraction module
 Extracts entities and relationships from text using LLM
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 import uuid
@@ -57,7 +58,8 @@ class GraphExtractionModule:
     async def extract_from_chunks(
         self,
         chunks: List[Dict[str, Any]],
-        batch_size: int = 5
+        batch_size: int = 5,
+        max_concurrency: int = 8
     ) -> Dict[str, Any]:
         """
         Extract entities and relationships from chunks
@@ -65,6 +67,7 @@ class GraphExtractionModule:
         Args:
             chunks: List of chunk dictionaries
             batch_size: Number of chunks to process together
+            max_concurrency: Maximum extraction requests in flight at once
 
         Returns:
             Dictionary with nodes and edges
@@ -76,56 +79,26 @@ class GraphExtractionModule:
         total_cost = 0.0
         total_tokens = 0
 
-        # Process chunks in batches
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i + batch_size]
-
-            # Combine chunk texts
-            combined_text = "\n\n".join([
-                f"[Chunk {j+1} - Page {chunk.get('page_no', 'N/A')}]: {chunk.get('text', '')}"
-                for j, chunk in enumerate(batch)
-            ])
-
-            try:
-                # Extract entities and relationships
-                result = await self.llm.extract_entities(
-                    text=combined_text,
-                    entity_types=self.entity_types
-                )
-
-                # Process extracted entities
-                for entity in result.get("entities", []):
-                    # Map chunk IDs to entities
-                    entity_chunk_ids = [chunk["chunk_id"] for chunk in batch]
-
-                    # Create entity node
-                    node = {
-                        "node_id": entity.get("id") or self._generate_entity_id(entity["label"]),
-                        "label": entity["label"],
-                        "node_type": entity.get("type", "Other"),
-                        "properties": entity.get("properties", {}),
-                        "chunk_ids": entity_chunk_ids
-                    }
-                    all_entities.append(node)
-
-                # Process extracted relationships
-                for relationship in result.get("relationships", []):
-                    edge = {
-                        "source": relationship["source"],
-                        "target": relationship["target"],
-                        "edge_type": relationship.get("type", "OTHER"),
-                        "properties": relationship.get("properties", {}),
-                        "evidence_chunk_ids": [chunk["chunk_id"] for chunk in batch]
-                    }
-                    all_relationships.append(edge)
-
-                # Track cost and tokens
-                total_cost += result.get("cost", 0.0)
-                total_tokens += result.get("tokens_used", 0)
-
-            except Exception as e:
-                logger.error(f"Error extracting from batch {i//batch_size + 1}: {e}")
+        # Process batches concurrently, bounded so the LLM adapter isn't swamped
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_batch(batch_index: int, batch: List[Dict[str, Any]]):
+            async with semaphore:
+                return await self._extract_batch(batch_index, batch)
+
+        batches = [chunks[i:i + batch_size] for i in range(0, len(chunks), batch_size)]
+        results = await asyncio.gather(*[
+            run_batch(batch_index, batch) for batch_index, batch in enumerate(batches)
+        ])
+
+        # Merge in batch order so deduplication keeps the same first occurrence
+        for result in results:
+            if result is None:
                 continue
+            all_entities.extend(result["entities"])
+            all_relationships.extend(result["relationships"])
+            total_cost += result["cost"]
+            total_tokens += result["tokens_used"]
 
         # Deduplicate entities
         unique_entities = self._deduplicate_entities(all_entities)
@@ -146,6 +119,72 @@ class GraphExtractionModule:
             }
         }
 
+    async def _extract_batch(
+        self,
+        batch_index: int,
+        batch: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract entities and relationships from one batch of chunks
+
+        Args:
+            batch_index: Zero-based batch position (for logging)
+            batch: Chunk dictionaries in this batch
+
+        Returns:
+            Dictionary with entities, relationships, cost and tokens, or None on error
+        """
+        # Combine chunk texts
+        combined_text = "\n\n".join([
+            f"[Chunk {j+1} - Page {chunk.get('page_no', 'N/A')}]: {chunk.get('text', '')}"
+            for j, chunk in enumerate(batch)
+        ])
+
+        try:
+            # Extract entities and relationships
+            result = await self.llm.extract_entities(
+                text=combined_text,
+                entity_types=self.entity_types
+            )
+
+            batch_chunk_ids = [chunk["chunk_id"] for chunk in batch]
+
+            # Process extracted entities
+            entities = []
+            for entity in result.get("entities", []):
+                # Create entity node
+                node = {
+                    "node_id": entity.get("id") or self._generate_entity_id(entity["label"]),
+                    "label": entity["label"],
+                    "node_type": entity.get("type", "Other"),
+                    "properties": entity.get("properties", {}),
+                    "chunk_ids": list(batch_chunk_ids)
+                }
+                entities.append(node)
+
+            # Process extracted relationships
+            relationships = []
+            for relationship in result.get("relationships", []):
+                edge = {
+                    "source": relationship["source"],
+                    "target": relationship["target"],
+                    "edge_type": relationship.get("type", "OTHER"),
+                    "properties": relationship.get("properties", {}),
+                    "evidence_chunk_ids": list(batch_chunk_ids)
+                }
+                relationships.append(edge)
+
+            return {
+                "entities": entities,
+                "relationships": relationships,
+                "cost": result.get("cost", 0.0),
+                "tokens_used": result.get("tokens_used", 0)
+            }
+
+        except Exception as e:
+            logger.error(f"Error extracting from batch {batch_index + 1}: {e}")
+            return None
+
     async def extract_from_text(
         self,
         text: str,
@@ -3,15 +3,33 @@ Hallucination Detection Check
 Detects fabricated information not present in context
 """
 
+import hashlib
 import json
+import math
+from collections import OrderedDict
 from typing import Dict, Any, List
 
+from app.adapters.base import LLMAdapter
+
 
 class HallucinationCheck:
     """Detects hallucinated content"""
 
-    def __init__(self, llm_adapter):
+    def __init__(
+        self,
+        llm_adapter: LLMAdapter,
+        cache_size: int = 1024,
+        max_tokens: int = 256
+    ) -> None:
         self.llm = llm_adapter
+        # Cap on the judge's output. The prompt bounds the list well under
+        # it; a reply that is still cut off fails to parse and takes the
+        # error path like any other non-JSON reply.
+        self.max_tokens = max_tokens
+        # LRU of raw LLM responses keyed by a digest of the prompt, so
+        # re-judging the same answer against the same context is free
+        self.cache_size = cache_size
+        self._response_cache: OrderedDict[bytes, str] = OrderedDict()
 
     async def evaluate(
         self,
@@ -31,24 +49,20 @@ Context:
 Answer:
 {answer}
 
-Identify any hallucinated content. Output JSON:
+Identify any hallucinated content. Output JSON with the score first:
 {{
-  "hallucinations": ["hallucination 1", "hallucination 2"],
-  "hallucination_score": 0.0-1.0
+  "hallucination_score": 0.0-1.0,
+  "hallucinations": ["hallucination 1", "hallucination 2"]
 }}
 
-Score 0.0 = severe hallucinations, 1.0 = no hallucinations"""
+Score 0.0 = severe hallucinations, 1.0 = no hallucinations
+List at most 5 hallucinations, each in under 15 words."""
 
         try:
-            response = await self.llm.generate(
-                prompt=prompt,
-                json_mode=True,
-                temperature=0.0
-            )
-
-            result = json.loads(response["content"])
+            content = await self._generate_cached(prompt)
+            result = json.loads(content)
             # LLM returns score where 1.0 = no hallucinations, 0.0 = severe hallucinations
-            score = result.get("hallucination_score", 0.5)
+            score = self._parse_score(result)
 
             return {
                 "score": score,
@@ -62,3 +76,51 @@ Score 0.0 = severe hallucinations, 1.0 = no hallucinations"""
                 "details": {"error": str(e)},
                 "message": f"Hallucination check error: {e}"
             }
+
+    async def _generate_cached(self, prompt: str) -> str:
+        """
+        Return the LLM response for a prompt, reusing a cached one if present
+
+        Args:
+            prompt: Fully rendered prompt
+
+        Returns:
+            Raw response content
+        """
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            return cached
+
+        response = await self.llm.generate(
+            prompt=prompt,
+            json_mode=True,
+            temperature=0.0,
+            max_tokens=self.max_tokens
+        )
+        content: str = response["content"]
+
+        self._response_cache[key] = content
+        if len(self._response_cache) > self.cache_size:
+            self._response_cache.popitem(last=False)
+        return content
+
+    @staticmethod
+    def _parse_score(result: Dict[str, Any]) -> float:
+        """
+        Read the hallucination score from a parsed judge reply
+
+        Args:
+            result: Parsed JSON reply
+
+        Returns:
+            Score clamped to [0.0, 1.0] (0.5 if the reply has no score)
+
+        Raises:
+            ValueError: If the score is not a number
+        """
+        score = float(result.get("hallucination_score", 0.5))
+        if math.isnan(score):
+            raise ValueError("hallucination_score is not a number")
+        return min(max(score, 0.0), 1.0)
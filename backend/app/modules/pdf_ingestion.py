@@ -1,13 +1,17 @@
 """
 PDF ingestion module
-Extracts text from PDFs with page-aware processing using pdfplumber
+Extracts text from PDFs with page-aware processing using pypdfium2
 """
 
+import asyncio
+import hashlib
 import logging
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-import pdfplumber
+from typing import AsyncIterator, Dict, Any, Optional, List, Union
+import pypdfium2 as pdfium
 from datetime import datetime
 import uuid
 
@@ -15,13 +19,32 @@ from app.core.models import Document, Page
 
 logger = logging.getLogger(__name__)
 
+# PDFium is not thread-safe; every call into it goes through this lock, so
+# documents ingested concurrently only overlap outside PDFium
+_PDFIUM_LOCK = threading.Lock()
+
+# PDF header marker; readers accept it anywhere in the first 1024 bytes
+_PDF_MAGIC = b"%PDF-"
+_PDF_HEADER_WINDOW = 1024
+
+
+class InvalidPDFError(ValueError):
+    """Raised when input is not a PDF at all (no %PDF- header)"""
+
 
 class PDFIngestionModule:
     """Handles PDF document ingestion and text extraction"""
 
-    def __init__(self):
-        """Initialize PDF ingestion module"""
-        pass
+    def __init__(self, parse_cache_size: int = 32):
+        """
+        Initialize PDF ingestion module
+
+        Args:
+            parse_cache_size: Max parsed PDFs kept in the content-hash cache
+        """
+        self.parse_cache_size = parse_cache_size
+        # LRU of extracted pages keyed by BLAKE2b digest of the PDF bytes
+        self._parse_cache: "OrderedDict[bytes, List[Page]]" = OrderedDict()
 
     async def ingest_pdf(
         self,
@@ -43,6 +66,145 @@ class PDFIngestionModule:
             effective_date: Effective date
             state: State jurisdiction
 
+        Returns:
+            Document object with extracted pages
+        """
+        return await self._ingest(
+            file_path, filename, doc_type, form_number, effective_date, state
+        )
+
+    async def ingest_pdf_bytes(
+        self,
+        data: bytes,
+        filename: str,
+        doc_type: Optional[str] = None,
+        form_number: Optional[str] = None,
+        effective_date: Optional[str] = None,
+        state: Optional[str] = None
+    ) -> Document:
+        """
+        Ingest an in-memory PDF without writing it to disk first
+
+        Args:
+            data: Raw PDF bytes
+            filename: Original filename
+            doc_type: Document type (e.g., "policy", "endorsement")
+            form_number: Insurance form number
+            effective_date: Effective date
+            state: State jurisdiction
+
+        Returns:
+            Document object with extracted pages
+        """
+        return await self._ingest(
+            data, filename, doc_type, form_number, effective_date, state
+        )
+
+    async def ingest_pdf_stream(
+        self,
+        file_paths: List[Path],
+        queue_size: int = 4,
+        batch_size: int = 1,
+        batch_timeout: float = 0.5
+    ) -> AsyncIterator[List[Document]]:
+        """
+        Ingest many PDFs as a pipeline, yielding documents in batches
+
+        Reading, parsing and the caller's persistence run as overlapping
+        stages joined by bounded queues, so disk reads for the next file
+        hide under parsing of the current one and memory stays bounded by
+        queue_size. A batch is yielded once it holds batch_size documents
+        or batch_timeout seconds pass with a partial batch waiting.
+
+        Args:
+            file_paths: PDF files to ingest, in order
+            queue_size: Max items buffered between stages
+            batch_size: Documents per yielded batch
+            batch_timeout: Seconds to wait before flushing a partial batch
+
+        Yields:
+            Lists of Document objects, in input order
+        """
+        read_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        doc_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        # Stages forward exceptions downstream in place of items, so a
+        # failure surfaces to the caller instead of stalling the pipeline
+        async def read_files() -> None:
+            try:
+                for path in file_paths:
+                    data = await asyncio.to_thread(Path(path).read_bytes)
+                    await read_queue.put((Path(path), data))
+            except Exception as e:
+                await read_queue.put(e)
+                return
+            await read_queue.put(None)
+
+        async def parse_files() -> None:
+            while (item := await read_queue.get()) is not None:
+                if isinstance(item, Exception):
+                    await doc_queue.put(item)
+                    return
+                path, data = item
+                try:
+                    document = await self._ingest(data, path.name, None, None, None, None)
+                except Exception as e:
+                    await doc_queue.put(e)
+                    return
+                document.metadata["file_path"] = str(path)
+                await doc_queue.put(document)
+            await doc_queue.put(None)
+
+        stages = [asyncio.create_task(read_files()), asyncio.create_task(parse_files())]
+
+        try:
+            batch: List[Document] = []
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        doc_queue.get(), batch_timeout if batch else None
+                    )
+                except asyncio.TimeoutError:
+                    yield batch
+                    batch = []
+                    continue
+
+                if isinstance(item, Exception):
+                    raise item
+                if item is None:
+                    break
+
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+            if batch:
+                yield batch
+        finally:
+            for stage in stages:
+                stage.cancel()
+
+    async def _ingest(
+        self,
+        source: Union[Path, bytes],
+        filename: str,
+        doc_type: Optional[str],
+        form_number: Optional[str],
+        effective_date: Optional[str],
+        state: Optional[str]
+    ) -> Document:
+        """
+        Ingest a PDF from a path or raw bytes
+
+        Args:
+            source: Path to PDF file or raw PDF bytes
+            filename: Original filename
+            doc_type: Document type
+            form_number: Insurance form number
+            effective_date: Effective date
+            state: State jurisdiction
+
         Returns:
             Document object with extracted pages
         """
@@ -52,8 +214,19 @@ class PDFIngestionModule:
             # Generate document ID
             doc_id = str(uuid.uuid4())
 
-            # Extract pages from PDF
-            pages = await self._extract_pages(file_path)
+            # Read the file once; the same bytes are hashed for the parse
+            # cache and handed to PDFium
+            if isinstance(source, bytes):
+                data = source
+            else:
+                data = await asyncio.to_thread(Path(source).read_bytes)
+
+            # Reject non-PDF input before any parser setup
+            if _PDF_MAGIC not in data[:_PDF_HEADER_WINDOW]:
+                raise InvalidPDFError("missing %PDF- header")
+
+            # Extract pages from PDF, reusing an earlier parse of identical bytes
+            pages = await self._extract_pages_cached(data)
 
             # Extract metadata from content if not provided
             if not form_number or not doc_type:
@@ -63,6 +236,13 @@ class PDFIngestionModule:
                 state = state or extracted_meta.get("state")
                 effective_date = effective_date or extracted_meta.get("effective_date")
 
+            metadata = {
+                "total_pages": len(pages),
+                "total_chars": sum(page.char_count for page in pages),
+            }
+            if not isinstance(source, bytes):
+                metadata["file_path"] = str(source)
+
             # Create Document object
             document = Document(
                 doc_id=doc_id,
@@ -72,11 +252,7 @@ class PDFIngestionModule:
                 effective_date=effective_date,
                 state=state,
                 pages=pages,
-                metadata={
-                    "total_pages": len(pages),
-                    "total_chars": sum(page.char_count for page in pages),
-                    "file_path": str(file_path)
-                },
+                metadata=metadata,
                 created_at=datetime.now()
             )
 
@@ -87,47 +263,104 @@ class PDFIngestionModule:
             logger.error(f"Error ingesting PDF {filename}: {e}")
             raise
 
-    async def _extract_pages(self, file_path: Path) -> List[Page]:
+    async def _extract_pages_cached(self, data: bytes) -> List[Page]:
+        """
+        Extract pages, serving repeat uploads of the same PDF from the cache
+
+        Args:
+            data: Raw PDF bytes
+
+        Returns:
+            List of Page objects (copies, so callers can't alter the cache)
+        """
+        key = hashlib.blake2b(data, digest_size=16).digest()
+
+        cached = self._parse_cache.get(key)
+        if cached is not None:
+            self._parse_cache.move_to_end(key)
+            logger.info(f"Parse cache hit: reusing {len(cached)} extracted pages")
+            return [page.model_copy(deep=True) for page in cached]
+
+        pages = await self._extract_pages(data)
+
+        # Empty results may be extraction failures; don't pin them
+        if pages:
+            self._parse_cache[key] = [page.model_copy(deep=True) for page in pages]
+            while len(self._parse_cache) > self.parse_cache_size:
+                self._parse_cache.popitem(last=False)
+
+        return pages
+
+    async def _extract_pages(self, source: Union[Path, bytes]) -> List[Page]:
         """
         Extract text from PDF pages
 
+        Pages are extracted sequentially: PDFium calls are serialized by
+        the lock, so a per-document thread pool would only add overhead.
+        The extraction runs in one worker thread to keep the event loop
+        free while PDFium parses.
+
         Args:
-            file_path: Path to PDF file
+            source: Path to PDF file or raw PDF bytes
 
         Returns:
             List of Page objects
         """
-        pages = []
-
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, pdf_page in enumerate(pdf.pages, start=1):
-                    # Extract text from page
-                    text = pdf_page.extract_text() or ""
-
-                    # Clean up text
-                    text = self._clean_text(text)
-
-                    # Create Page object
-                    page = Page(
-                        page_no=page_num,
-                        text=text,
-                        char_count=len(text),
-                        metadata={
-                            "width": pdf_page.width,
-                            "height": pdf_page.height,
-                        }
-                    )
-                    pages.append(page)
-
+            pages = await asyncio.to_thread(self._extract_pages_sync, source)
             logger.info(f"Extracted {len(pages)} pages from PDF")
             return pages
-
         except Exception as e:
             logger.error(f"Error extracting pages: {e}")
             # Return empty list if extraction fails
             return []
 
+    def _extract_pages_sync(self, source: Union[Path, bytes]) -> List[Page]:
+        """
+        Extract every page of a PDF (blocking)
+
+        Args:
+            source: Path to PDF file or raw PDF bytes
+
+        Returns:
+            List of Page objects
+        """
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(source)
+            num_pages = len(pdf)
+
+        pages = []
+        try:
+            for page_index in range(num_pages):
+                # Extract text and size from page (PDFium's C++ text layer)
+                with _PDFIUM_LOCK:
+                    pdf_page = pdf[page_index]
+                    textpage = pdf_page.get_textpage()
+                    text = textpage.get_text_range()
+                    width, height = pdf_page.get_size()
+                    textpage.close()
+                    pdf_page.close()
+
+                # Clean up text
+                text = self._clean_text(text)
+
+                # Create Page object
+                page = Page(
+                    page_no=page_index + 1,
+                    text=text,
+                    char_count=len(text),
+                    metadata={
+                        "width": width,
+                        "height": height,
+                    }
+                )
+                pages.append(page)
+        finally:
+            with _PDFIUM_LOCK:
+                pdf.close()
+
+        return pages
+
     def _clean_text(self, text: str) -> str:
         """
         Clean extracted text
@@ -248,18 +481,28 @@ class PDFIngestionModule:
 
         validation["info"]["file_size"] = file_size
 
+        # Cheap header check before handing the file to PDFium
+        with open(file_path, "rb") as f:
+            header = f.read(_PDF_HEADER_WINDOW)
+        if _PDF_MAGIC not in header:
+            validation["valid"] = False
+            validation["errors"].append("Not a PDF file: missing %PDF- header")
+            return validation
+
         # Try to open and validate PDF
         try:
-            with pdfplumber.open(file_path) as pdf:
-                num_pages = len(pdf.pages)
-                validation["info"]["num_pages"] = num_pages
-
-                if num_pages == 0:
-                    validation["valid"] = False
-                    validation["errors"].append("PDF has no pages")
-
-                if num_pages > 500:
-                    validation["warnings"].append(f"Large PDF with {num_pages} pages")
+            with _PDFIUM_LOCK:
+                pdf = pdfium.PdfDocument(file_path)
+                num_pages = len(pdf)
+                pdf.close()
+            validation["info"]["num_pages"] = num_pages
+
+            if num_pages == 0:
+                validation["valid"] = False
+                validation["errors"].append("PDF has no pages")
+
+            if num_pages > 500:
+                validation["warnings"].append(f"Large PDF with {num_pages} pages")
 
         except Exception as e:
             validation["valid"] = False
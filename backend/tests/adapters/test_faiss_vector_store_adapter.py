@@ -0,0 +1,169 @@
+"""
+Unit tests for FAISSVectorStoreAdapter
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pytest
+
+from app.adapters.faiss_vector_store import FAISSVectorStoreAdapter
+
+_DIMENSION = 16
+
+
+async def _open_store(data_dir: Path, **kwargs) -> FAISSVectorStoreAdapter:
+    """Create a store and wait for the load its constructor schedules."""
+    store = FAISSVectorStoreAdapter(data_dir, **kwargs)
+    # __init__ starts _initialize as a task, which takes the lock before its
+    # first await; one loop turn plus a lock round-trip waits it out
+    await asyncio.sleep(0)
+    async with store._lock:
+        pass
+    return store
+
+
+def _sample_embeddings(n: int = 3, dimension: int = _DIMENSION) -> list[list[float]]:
+    """Unit-length random embeddings, like the embedder's output."""
+    vectors = np.random.default_rng(0).standard_normal((n, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.tolist()
+
+
+@pytest.mark.unit
+class TestFAISSVectorStoreAdapter:
+    """Test cases for FAISSVectorStoreAdapter."""
+
+    @pytest.fixture
+    def embeddings(self) -> list[list[float]]:
+        """Three sample embeddings."""
+        return _sample_embeddings()
+
+    @pytest.fixture
+    def chunk_ids(self) -> list[str]:
+        """Chunk ids for the sample embeddings."""
+        return ["chunk1", "chunk2", "chunk3"]
+
+    @pytest.fixture
+    def metadata(self) -> list[dict]:
+        """Metadata for the sample embeddings."""
+        return [
+            {"doc_id": "doc123", "page_no": 1},
+            {"doc_id": "doc123", "page_no": 1},
+            {"doc_id": "doc456", "page_no": 2},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fp16_save_load_round_trip(
+        self, tmp_path: Path, chunk_ids: list, embeddings: list, metadata: list
+    ):
+        """Test an fp16 index survives save and load with its ids and metadata."""
+        store = await _open_store(tmp_path, dimension=_DIMENSION)
+        assert isinstance(store.index, faiss.IndexScalarQuantizer)
+        await store.add_embeddings(chunk_ids, embeddings, metadata)
+        await store.save_index(tmp_path)
+
+        reloaded = await _open_store(tmp_path, dimension=_DIMENSION)
+
+        assert isinstance(reloaded.index, faiss.IndexScalarQuantizer)
+        assert await reloaded.get_index_size() == 3
+        assert reloaded.chunk_ids == chunk_ids
+        assert reloaded.metadata["chunk3"] == {"doc_id": "doc456", "page_no": 2}
+
+        results = await reloaded.search(embeddings[1], k=3)
+        assert results[0]["chunk_id"] == "chunk2"
+        assert results[0]["distance"] == pytest.approx(0.0, abs=1e-3)
+
+        # float16 storage: reconstructed vectors are close, not exact
+        vector = await reloaded.get_embedding("chunk2")
+        np.testing.assert_allclose(vector, embeddings[1], atol=1e-3)
+
+    @pytest.mark.asyncio
+    async def test_search_full_precision(
+        self, tmp_path: Path, chunk_ids: list, embeddings: list, metadata: list
+    ):
+        """Test use_fp16=False stores and searches exact float32 vectors."""
+        store = await _open_store(tmp_path, dimension=_DIMENSION, use_fp16=False)
+        await store.add_embeddings(chunk_ids, embeddings, metadata)
+
+        assert isinstance(store.index, faiss.IndexFlatL2)
+        results = await store.search(embeddings[2], k=2)
+
+        assert results[0]["chunk_id"] == "chunk3"
+        assert results[0]["distance"] == 0.0
+        assert results[0]["score"] == 1.0
+        assert len(results) == 2
+        assert await store.get_embedding("chunk3") == embeddings[2]
+
+        filtered = await store.search(embeddings[2], k=3, filters={"doc_id": "doc123"})
+        assert {result["chunk_id"] for result in filtered} == {"chunk1", "chunk2"}
+
+    @pytest.mark.asyncio
+    async def test_dimension_mismatch_discards_index(
+        self,
+        tmp_path: Path,
+        chunk_ids: list,
+        embeddings: list,
+        metadata: list,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        """Test a stored index of another dimension is dropped with an error logged."""
+        store = await _open_store(tmp_path, dimension=_DIMENSION)
+        await store.add_embeddings(chunk_ids, embeddings, metadata)
+        await store.save_index(tmp_path)
+
+        with caplog.at_level(logging.ERROR, logger="app.adapters.faiss_vector_store"):
+            reloaded = await _open_store(tmp_path, dimension=8)
+
+        errors = [record for record in caplog.records if record.levelno == logging.ERROR]
+        assert len(errors) == 1
+        assert "discarding its 3 vectors" in errors[0].getMessage()
+
+        assert await reloaded.get_index_size() == 0
+        assert reloaded.index.d == 8
+        assert reloaded.chunk_ids == []
+        assert reloaded.metadata == {}
+
+        # Re-indexing with the new embedder's dimension works
+        await reloaded.add_embeddings(["chunk9"], _sample_embeddings(1, 8), [{}])
+        assert await reloaded.get_index_size() == 1
+
+    @pytest.mark.asyncio
+    async def test_chunk_meta_jsonl_round_trip(
+        self, tmp_path: Path, chunk_ids: list, embeddings: list
+    ):
+        """Test chunk metadata with datetimes and non-str keys survives save and load."""
+        metadata = [
+            {
+                "indexed_at": datetime(2024, 5, 1, 12, 30, 15, 123456),
+                "effective": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                "page_widths": {1: 612, 2: 792},
+                "title": "R\u00e9sidence \u2014 Coverage A",
+            },
+            {},
+            {"doc_id": "doc456"},
+        ]
+        store = await _open_store(tmp_path, dimension=_DIMENSION)
+        await store.add_embeddings(chunk_ids, embeddings, metadata)
+        await store.save_index(tmp_path)
+
+        # One JSON object per line, readable by the json module
+        lines = (tmp_path / "chunk_meta.jsonl").read_text("utf-8").splitlines()
+        assert [json.loads(line)["chunk_id"] for line in lines] == chunk_ids
+
+        reloaded = await _open_store(tmp_path, dimension=_DIMENSION)
+
+        # Datetimes come back as ISO 8601 strings, int keys as str keys (as json.dumps does)
+        assert reloaded.metadata["chunk1"] == {
+            "indexed_at": "2024-05-01T12:30:15.123456",
+            "effective": "2024-01-01T00:00:00+00:00",
+            "page_widths": {"1": 612, "2": 792},
+            "title": "R\u00e9sidence \u2014 Coverage A",
+        }
+        assert reloaded.metadata["chunk2"] == {}
+        assert reloaded.metadata["chunk3"] == {"doc_id": "doc456"}
@@ -22,25 +22,25 @@ class TestFileDocStore:
 
     @pytest.mark.asyncio
     async def test_save_and_get_document(
-        self, doc_store: FileDocStore, sample_document: Document
+        self, doc_store: FileDocStore, sample_document_full: Document
     ):
         """Test saving and retrieving a document."""
         # Save document
-        await doc_store.save_document(sample_document)
+        await doc_store.save_document(sample_document_full)
 
         # Verify file was created
         doc_path = os.path.join(
-            doc_store.docs_dir, f"{sample_document.doc_id}.json"
+            doc_store.docs_dir, f"{sample_document_full.doc_id}.json"
         )
         assert os.path.exists(doc_path)
 
         # Retrieve document
-        retrieved = await doc_store.get_document(sample_document.doc_id)
+        retrieved = await doc_store.get_document(sample_document_full.doc_id)
         assert retrieved is not None
-        assert retrieved.doc_id == sample_document.doc_id
-        assert retrieved.filename == sample_document.filename
-        assert len(retrieved.pages) == len(sample_document.pages)
-        assert retrieved.metadata == sample_document.metadata
+        assert retrieved.doc_id == sample_document_full.doc_id
+        assert retrieved.filename == sample_document_full.filename
+        assert len(retrieved.pages) == len(sample_document_full.pages)
+        assert retrieved.metadata == sample_document_full.metadata
 
     @pytest.mark.asyncio
     async def test_get_nonexistent_document(self, doc_store: FileDocStore):
@@ -50,7 +50,7 @@ class TestFileDocStore:
 
     @pytest.mark.asyncio
     async def test_list_documents(
-        self, doc_store: FileDocStore, sample_document: Document
+        self, doc_store: FileDocStore, sample_document_min: Document
     ):
         """Test listing all documents."""
         # Initially empty
@@ -58,27 +58,27 @@ class TestFileDocStore:
         assert len(docs) == 0
 
         # Save a document
-        await doc_store.save_document(sample_document)
+        await doc_store.save_document(sample_document_min)
 
         # List should contain the document
         docs = await doc_store.list_documents()
         assert len(docs) == 1
-        assert docs[0].doc_id == sample_document.doc_id
+        assert docs[0].doc_id == sample_document_min.doc_id
 
     @pytest.mark.asyncio
     async def test_delete_document(
-        self, doc_store: FileDocStore, sample_document: Document
+        self, doc_store: FileDocStore, sample_document_min: Document
     ):
         """Test deleting a document."""
         # Save document first
-        await doc_store.save_document(sample_document)
-        assert await doc_store.get_document(sample_document.doc_id) is not None
+        await doc_store.save_document(sample_document_min)
+        assert await doc_store.get_document(sample_document_min.doc_id) is not None
 
         # Delete document
-        await doc_store.delete_document(sample_document.doc_id)
+        await doc_store.delete_document(sample_document_min.doc_id)
 
         # Verify it's gone
-        assert await doc_store.get_document(sample_document.doc_id) is None
+        assert await doc_store.get_document(sample_document_min.doc_id) is None
 
     @pytest.mark.asyncio
     async def test_save_and_get_chunks(
@@ -138,25 +138,25 @@ class TestFileDocStore:
 
     @pytest.mark.asyncio
     async def test_update_document_metadata(
-        self, doc_store: FileDocStore, sample_document: Document
+        self, doc_store: FileDocStore, sample_document_min: Document
     ):
         """Test updating document metadata."""
         # Save document
-        await doc_store.save_document(sample_document)
+        await doc_store.save_document(sample_document_min)
 
         # Update metadata
-        new_metadata = {**sample_document.metadata, "indexed": True}
-        sample_document.metadata = new_metadata
-        await doc_store.save_document(sample_document)
+        new_metadata = {**sample_document_min.metadata, "indexed": True}
+        sample_document_min.metadata = new_metadata
+        await doc_store.save_document(sample_document_min)
 
         # Retrieve and verify
-        retrieved = await doc_store.get_document(sample_document.doc_id)
+        retrieved = await doc_store.get_document(sample_document_min.doc_id)
         assert retrieved is not None
         assert retrieved.metadata["indexed"] is True
 
     @pytest.mark.asyncio
     async def test_concurrent_saves(
-        self, doc_store: FileDocStore, sample_document: Document
+        self, doc_store: FileDocStore, sample_document_min: Document
     ):
         """Test concurrent document saves."""
         import asyncio
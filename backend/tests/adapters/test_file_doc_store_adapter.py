@@ -0,0 +1,187 @@
+"""
+Unit tests for FileDocStoreAdapter
+"""
+
+import copy
+import json
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import aiofiles
+import pytest
+
+from app.adapters import file_doc_store
+from app.adapters.file_doc_store import FileDocStoreAdapter
+
+
+def _sample_document(version: int) -> dict:
+    """Document dict as the ingest API saves it."""
+    return {
+        "doc_id": "doc123",
+        "filename": "sample.pdf",
+        "doc_type": "policy",
+        "pages": [{"page_no": 1, "text": f"Version {version}", "char_count": 9}],
+        "metadata": {"version": version},
+    }
+
+
+@pytest.mark.unit
+class TestDocumentCache:
+    """Test cases for the parsed-document cache."""
+
+    @pytest.fixture
+    def doc_store(self, tmp_path: Path) -> FileDocStoreAdapter:
+        """Create a FileDocStoreAdapter under pytest's tmp_path."""
+        return FileDocStoreAdapter(tmp_path)
+
+    @pytest.fixture
+    def open_calls(self, monkeypatch: pytest.MonkeyPatch) -> list:
+        """Record every file the doc store opens."""
+        calls = []
+        real_open = aiofiles.open
+
+        def counting_open(path, *args, **kwargs):
+            calls.append(Path(path))
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr(file_doc_store.aiofiles, "open", counting_open)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_disk_read(
+        self, doc_store: FileDocStoreAdapter, open_calls: list
+    ):
+        """Test a repeated get is served from the cache."""
+        await doc_store.save_document("doc123", _sample_document(1))
+
+        first = await doc_store.get_document("doc123")
+        reads = len(open_calls)
+        second = await doc_store.get_document("doc123")
+
+        assert second is first
+        assert len(open_calls) == reads
+
+    @pytest.mark.asyncio
+    async def test_save_document_invalidates(self, doc_store: FileDocStoreAdapter):
+        """Test saving a document replaces the cached copy."""
+        await doc_store.save_document("doc123", _sample_document(1))
+        await doc_store.get_document("doc123")
+
+        await doc_store.save_document("doc123", _sample_document(2))
+
+        document = await doc_store.get_document("doc123")
+        assert document["metadata"]["version"] == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_document_invalidates(self, doc_store: FileDocStoreAdapter):
+        """Test deleting a document drops the cached copy."""
+        await doc_store.save_document("doc123", _sample_document(1))
+        await doc_store.get_document("doc123")
+
+        assert await doc_store.delete_document("doc123") is True
+
+        assert await doc_store.get_document("doc123") is None
+
+    @pytest.mark.asyncio
+    async def test_other_instance_changes_are_seen(self, tmp_path: Path):
+        """Test a save or delete through another instance isn't masked by the cache."""
+        reader = FileDocStoreAdapter(tmp_path)
+        writer = FileDocStoreAdapter(tmp_path)
+        await writer.save_document("doc123", _sample_document(1))
+        assert (await reader.get_document("doc123"))["metadata"]["version"] == 1
+
+        await writer.save_document("doc123", _sample_document(22))
+        assert (await reader.get_document("doc123"))["metadata"]["version"] == 22
+
+        await writer.delete_document("doc123")
+        assert await reader.get_document("doc123") is None
+
+    @pytest.mark.asyncio
+    async def test_external_rewrite_same_size(self, doc_store: FileDocStoreAdapter):
+        """Test a rewrite that keeps the size is caught by its new mtime."""
+        await doc_store.save_document("doc123", _sample_document(1))
+        await doc_store.get_document("doc123")
+
+        doc_path = doc_store.docs_dir / "doc123.json"
+        content = doc_path.read_text()
+        doc_path.write_text(content.replace('"version": 1', '"version": 7'))
+        stat = doc_path.stat()
+        os.utime(doc_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        document = await doc_store.get_document("doc123")
+        assert document["metadata"]["version"] == 7
+
+    @pytest.mark.asyncio
+    async def test_callers_copy_before_mutating(self, doc_store: FileDocStoreAdapter):
+        """Test the documented rule: the returned dict is shared with the cache."""
+        await doc_store.save_document("doc123", _sample_document(1))
+        shared = await doc_store.get_document("doc123")
+
+        # Mutating a copy leaves later reads untouched
+        document = copy.deepcopy(shared)
+        document["metadata"]["version"] = 99
+        document["pages"].clear()
+
+        cached = await doc_store.get_document("doc123")
+        assert cached is shared
+        assert cached["metadata"]["version"] == 1
+        assert len(cached["pages"]) == 1
+
+
+@pytest.mark.unit
+class TestChunkJsonl:
+    """Test cases for the orjson-written chunk JSONL files."""
+
+    @pytest.fixture
+    def doc_store(self, tmp_path: Path) -> FileDocStoreAdapter:
+        """Create a FileDocStoreAdapter under pytest's tmp_path."""
+        return FileDocStoreAdapter(tmp_path)
+
+    @pytest.fixture
+    def chunks(self) -> list:
+        """Chunk dicts carrying values json and orjson treat differently."""
+        return [
+            {
+                "chunk_id": "doc123_p1_c0001",
+                "text": "Coverage A: Dwelling \u2014 $500,000 (r\u00e9sidence)",
+                "metadata": {
+                    "indexed_at": datetime(2024, 5, 1, 12, 30, 15, 123456),
+                    "effective": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                    "as_of": date(2024, 1, 1),
+                    "page_widths": {1: 612, 2: 792},
+                },
+            },
+            {"chunk_id": "doc123_p2_c0002", "text": "Exclusions", "metadata": {}},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_round_trip_matches_json(self, doc_store: FileDocStoreAdapter, chunks: list):
+        """Test chunks read back exactly as json.dumps(default=str) would write them."""
+        await doc_store.save_chunks("doc123", chunks)
+
+        loaded = await doc_store.get_chunks("doc123")
+
+        # save_chunks stamps saved_at on the dicts it is given
+        assert loaded == [json.loads(json.dumps(chunk, default=str)) for chunk in chunks]
+        metadata = loaded[0]["metadata"]
+        assert metadata["indexed_at"] == "2024-05-01 12:30:15.123456"
+        assert metadata["effective"] == "2024-01-01 00:00:00+00:00"
+        assert metadata["as_of"] == "2024-01-01"
+        assert metadata["page_widths"] == {"1": 612, "2": 792}
+        assert loaded[0]["text"] == chunks[0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_one_line_per_chunk(self, doc_store: FileDocStoreAdapter, chunks: list):
+        """Test the file is newline-terminated JSONL that the json module can read."""
+        await doc_store.save_chunks("doc123", chunks)
+
+        raw = (doc_store.chunks_dir / "doc123.jsonl").read_bytes()
+
+        assert raw.endswith(b"\n")
+        lines = raw.decode("utf-8").splitlines()
+        assert [json.loads(line)["chunk_id"] for line in lines] == [
+            "doc123_p1_c0001",
+            "doc123_p2_c0002",
+        ]
+        assert len({json.loads(line)["saved_at"] for line in lines}) == 1
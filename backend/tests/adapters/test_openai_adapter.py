@@ -2,6 +2,7 @@
 Unit tests for OpenAIAdapter
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -395,3 +396,78 @@ class TestOpenAIAdapter:
 
         assert len(embeddings) == 3
         assert all(len(emb) == 1536 for emb in embeddings)
+
+    @pytest.mark.asyncio
+    @patch("app.adapters.openai_adapter.tiktoken")
+    @patch("app.adapters.openai_adapter.AsyncOpenAI")
+    async def test_embed_dedupes_repeated_text(
+        self, mock_openai_class: MagicMock, mock_tiktoken: MagicMock
+    ):
+        """Test that repeated texts are embedded once and then served from cache."""
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(embedding=[0.1] * 1536)]
+        mock_response.usage = MagicMock(prompt_tokens=5, total_tokens=5)
+
+        mock_client = AsyncMock()
+        mock_client.embeddings.create = AsyncMock(return_value=mock_response)
+        mock_openai_class.return_value = mock_client
+
+        adapter = OpenAIAdapter(
+            api_key="test-key",
+            embedding_model="text-embedding-3-small",
+        )
+
+        # Same chunk text repeated, with one copy reflowed
+        texts = ["This is repeated text."] * 100 + ["This  is\nrepeated text."]
+        embeddings = await adapter.embed(texts)
+
+        assert len(embeddings) == len(texts)
+        mock_client.embeddings.create.assert_called_once()
+        assert mock_client.embeddings.create.call_args.kwargs["input"] == [
+            "This is repeated text."
+        ]
+
+        # A later call for the same text is a pure cache hit
+        await adapter.embed(["This is repeated text."])
+        mock_client.embeddings.create.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("app.adapters.openai_adapter.tiktoken")
+    @patch("app.adapters.openai_adapter.AsyncOpenAI")
+    async def test_embed_failure_cancels_pending_batches(
+        self, mock_openai_class: MagicMock, mock_tiktoken: MagicMock
+    ):
+        """Test a failed batch cancels the rest and surfaces its own error."""
+        adapter = OpenAIAdapter(
+            api_key="test-key",
+            embedding_model="text-embedding-3-small",
+            embedding_batch_size=1,
+            embedding_max_concurrency=2,
+        )
+
+        started = []
+        cancelled = []
+
+        async def fake_embed_batch(batch):
+            started.append(batch[0])
+            if batch[0] == "fast":
+                return [[0.1] * 1536]
+            if batch[0] == "bad":
+                await asyncio.sleep(0)
+                raise ValueError("embedding request rejected")
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(batch[0])
+                raise
+
+        adapter._embed_batch = fake_embed_batch
+
+        with pytest.raises(ValueError, match="rejected"):
+            await adapter.embed(["fast", "slow", "bad", "queued"])
+
+        # Every other batch that got a slot was cancelled, not left running
+        assert "slow" in cancelled
+        assert sorted(cancelled) == sorted(set(started) - {"fast", "bad"})
+        # Vectors that landed before the failure stay cached
+        assert len(adapter._embedding_cache) == 1
@@ -3,7 +3,6 @@ Integration tests for API endpoints
 """
 
 import json
-import tempfile
 from io import BytesIO
 from unittest.mock import AsyncMock, patch
 
@@ -3,6 +3,8 @@ Pytest configuration and shared fixtures
 """
 
 import asyncio
+import csv
+import logging
 import os
 import shutil
 import tempfile
@@ -23,26 +25,142 @@ from app.core.models import (
     Page,
     RelationType,
 )
+from app.modules.judge.checks.citation_coverage import CitationCoverageCheck
+from app.modules.judge.checks.groundedness import GroundednessCheck
+from app.modules.judge.checks.hallucination import HallucinationCheck
+
+logger = logging.getLogger(__name__)
+
+# Finish any deferred pydantic schema builds (forward refs) at import time so
+# the first test touching a model doesn't show up as slow in --durations.
+for _model in (Document, Page, Chunk, Citation, Node, Edge, GraphResult):
+    _model.model_rebuild()
+
+# Import the FastAPI app once at collection time so endpoint tests don't pay
+# for app construction inside the timed run. Set PYTEST_SKIP_APP_IMPORT=1 for
+# unit-only runs; test_client then falls back to importing on first use.
+_app_main = None
+if os.getenv("PYTEST_SKIP_APP_IMPORT") != "1":
+    try:
+        import app.main as _app_main
+    except (FileNotFoundError, ValueError) as e:
+        # Missing or invalid config/ files (e.g. running outside backend/):
+        # unit tests still collect and test_client re-raises on first use.
+        # Any other import error is a real bug and fails collection.
+        logger.warning(f"FastAPI app not imported at collection: {type(e).__name__}: {e}")
+        _app_main = None
 
 
 # === Pytest Configuration ===
 
+# Fixtures that stand up the FastAPI app or a temp filesystem; tests using
+# them are auto-marked ``integration`` so the fast lane can deselect them.
+INTEGRATION_FIXTURES = {"test_client", "test_data_dir"}
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark tests that depend on heavy fixtures as integration tests."""
+    for item in items:
+        if INTEGRATION_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.integration)
+
+
+# Per-test wall-clock budget in seconds. Calls over budget are listed in the
+# terminal summary; STRICT_TEST_BUDGET=1 also fails the run. Set
+# TEST_DURATIONS_CSV to a path to dump setup/call/teardown times per test.
+TEST_BUDGET_SECONDS = float(os.getenv("TEST_BUDGET_SECONDS", "1.0"))
+_durations: dict[str, dict[str, float]] = {}
+
+
+def pytest_runtest_logreport(report):
+    """Record setup/call/teardown durations (also runs on the xdist controller)."""
+    _durations.setdefault(report.nodeid, {})[report.when] = report.duration
+
+
+def _slow_tests() -> list[tuple[str, float]]:
+    return sorted(
+        (
+            (nodeid, phases["call"])
+            for nodeid, phases in _durations.items()
+            if phases.get("call", 0.0) > TEST_BUDGET_SECONDS
+        ),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Fail the session when STRICT_TEST_BUDGET is set and a test ran over budget."""
+    if os.getenv("STRICT_TEST_BUDGET") and _slow_tests() and exitstatus == 0:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report tests over TEST_BUDGET_SECONDS and optionally write a durations CSV."""
+    slow = _slow_tests()
+    if slow:
+        terminalreporter.write_sep("=", f"tests over {TEST_BUDGET_SECONDS:.2f}s budget")
+        for nodeid, duration in slow:
+            terminalreporter.write_line(f"SLOW {nodeid} {duration:.2f}s")
+
+    csv_path = os.getenv("TEST_DURATIONS_CSV")
+    if csv_path and _durations:
+        rows = sorted(
+            _durations.items(), key=lambda item: sum(item[1].values()), reverse=True
+        )
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["nodeid", "setup", "call", "teardown"])
+            for nodeid, phases in rows:
+                writer.writerow([
+                    nodeid,
+                    f"{phases.get('setup', 0.0):.4f}",
+                    f"{phases.get('call', 0.0):.4f}",
+                    f"{phases.get('teardown', 0.0):.4f}",
+                ])
+        terminalreporter.write_line(f"durations written to {csv_path}")
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Use uvloop's libuv-backed loop where available (not on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+def event_loop(event_loop_policy: asyncio.AbstractEventLoopPolicy):
+    """Create an instance of the event loop for the test session."""
+    loop = event_loop_policy.new_event_loop()
     yield loop
     loop.close()
 
 
 # === Temporary Directories ===
 
+def _fast_rmtree(path: str) -> None:
+    """Recursively delete a directory using os.scandir (fewer stat calls)."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _fast_rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
+
+
 @pytest.fixture
 def temp_dir() -> Generator[str, None, None]:
     """Create a temporary directory for tests."""
     temp_dir = tempfile.mkdtemp()
     yield temp_dir
-    shutil.rmtree(temp_dir, ignore_errors=True)
+    try:
+        _fast_rmtree(temp_dir)
+    except OSError:
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 @pytest.fixture
@@ -58,29 +176,74 @@ def test_data_dir(temp_dir: str) -> str:
 
 
 # === Sample Data Fixtures ===
+#
+# Sample models are built with normal (validated) construction so a fixture
+# that drifts from app/core/models.py fails loudly at setup.
 
-@pytest.fixture
-def sample_document() -> Document:
-    """Create a sample document for testing."""
-    return Document(
+def _sample_document_metadata() -> dict:
+    """Metadata shared by the sample document fixtures."""
+    return {
+        "form_number": "HO-3",
+        "doc_type": "policy",
+        "state": "CA",
+        "upload_date": "2024-01-01T00:00:00Z",
+    }
+
+
+def _sample_page(page_no: int, text: str) -> Page:
+    """Build a US Letter sample page."""
+    return Page(
+        page_no=page_no,
+        text=text,
+        char_count=len(text),
+        metadata={"width": 612, "height": 792},
+    )
+
+
+def _sample_chunk(chunk_id: str, page_no: int, text: str, char_start: int) -> Chunk:
+    """Build a sample chunk from the HO-3 sample document."""
+    return Chunk(
+        chunk_id=chunk_id,
         doc_id="doc123",
-        filename="sample.pdf",
+        text=text,
+        page_no=page_no,
+        char_start=char_start,
+        char_end=char_start + len(text),
+        tokens=len(text) // 4,
         metadata={
             "form_number": "HO-3",
             "doc_type": "policy",
             "state": "CA",
-            "upload_date": "2024-01-01T00:00:00Z",
         },
+    )
+
+
+@pytest.fixture
+def sample_document_min() -> Document:
+    """Create a sample document without pages, for tests that only read top-level fields."""
+    return Document(
+        doc_id="doc123",
+        filename="sample.pdf",
+        metadata=_sample_document_metadata(),
+        pages=[],
+    )
+
+
+@pytest.fixture
+def sample_document_full() -> Document:
+    """Create a sample document with pages for testing."""
+    return Document(
+        doc_id="doc123",
+        filename="sample.pdf",
+        metadata=_sample_document_metadata(),
         pages=[
-            Page(
-                page_num=1,
-                text="This is a homeowners insurance policy. Coverage A: Dwelling - $500,000. Coverage B: Other Structures - $50,000.",
-                bbox={"x0": 0, "y0": 0, "x1": 100, "y1": 100},
+            _sample_page(
+                1,
+                "This is a homeowners insurance policy. Coverage A: Dwelling - $500,000. Coverage B: Other Structures - $50,000.",
             ),
-            Page(
-                page_num=2,
-                text="Section I - Exclusions. We do not cover water damage caused by flood or surface water.",
-                bbox={"x0": 0, "y0": 0, "x1": 100, "y1": 100},
+            _sample_page(
+                2,
+                "Section I - Exclusions. We do not cover water damage caused by flood or surface water.",
             ),
         ],
     )
@@ -90,44 +253,23 @@ def sample_document() -> Document:
 def sample_chunks() -> list[Chunk]:
     """Create sample chunks for testing."""
     return [
-        Chunk(
-            chunk_id="chunk1",
-            doc_id="doc123",
-            text="This is a homeowners insurance policy. Coverage A: Dwelling - $500,000.",
-            metadata={
-                "page_num": 1,
-                "form_number": "HO-3",
-                "doc_type": "policy",
-                "state": "CA",
-            },
-            start_char=0,
-            end_char=75,
+        _sample_chunk(
+            "chunk1",
+            1,
+            "This is a homeowners insurance policy. Coverage A: Dwelling - $500,000.",
+            0,
         ),
-        Chunk(
-            chunk_id="chunk2",
-            doc_id="doc123",
-            text="Coverage B: Other Structures - $50,000. This provides coverage for detached structures.",
-            metadata={
-                "page_num": 1,
-                "form_number": "HO-3",
-                "doc_type": "policy",
-                "state": "CA",
-            },
-            start_char=76,
-            end_char=165,
+        _sample_chunk(
+            "chunk2",
+            1,
+            "Coverage B: Other Structures - $50,000. This provides coverage for detached structures.",
+            76,
         ),
-        Chunk(
-            chunk_id="chunk3",
-            doc_id="doc123",
-            text="Section I - Exclusions. We do not cover water damage caused by flood or surface water.",
-            metadata={
-                "page_num": 2,
-                "form_number": "HO-3",
-                "doc_type": "policy",
-                "state": "CA",
-            },
-            start_char=0,
-            end_char=88,
+        _sample_chunk(
+            "chunk3",
+            2,
+            "Section I - Exclusions. We do not cover water damage caused by flood or surface water.",
+            0,
         ),
     ]
 
@@ -138,27 +280,22 @@ def sample_nodes() -> list[Node]:
     return [
         Node(
             node_id="node1",
-            entity_name="Coverage A: Dwelling",
-            entity_type=EntityType.COVERAGE,
+            label="Coverage A: Dwelling",
+            node_type=EntityType.COVERAGE,
+            properties={"limit": "$500,000"},
             chunk_ids=["chunk1"],
-            doc_ids=["doc123"],
-            metadata={"limit": "$500,000"},
         ),
         Node(
             node_id="node2",
-            entity_name="Water Damage",
-            entity_type=EntityType.EXCLUSION,
+            label="Water Damage",
+            node_type=EntityType.EXCLUSION,
             chunk_ids=["chunk3"],
-            doc_ids=["doc123"],
-            metadata={},
         ),
         Node(
             node_id="node3",
-            entity_name="California",
-            entity_type=EntityType.STATE,
+            label="California",
+            node_type=EntityType.STATE,
             chunk_ids=["chunk1", "chunk2", "chunk3"],
-            doc_ids=["doc123"],
-            metadata={},
         ),
     ]
 
@@ -168,45 +305,75 @@ def sample_edges() -> list[Edge]:
     """Create sample graph edges for testing."""
     return [
         Edge(
-            edge_id="edge1",
-            source_id="node1",
-            target_id="node3",
-            relation_type=RelationType.APPLIES_TO,
-            metadata={},
+            source="node1",
+            target="node3",
+            edge_type=RelationType.APPLIES_IN,
         ),
         Edge(
-            edge_id="edge2",
-            source_id="node2",
-            target_id="node3",
-            relation_type=RelationType.APPLIES_TO,
-            metadata={},
+            source="node2",
+            target="node3",
+            edge_type=RelationType.APPLIES_IN,
         ),
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_citations() -> list[Citation]:
-    """Create sample citations for testing."""
+    """Create sample citations for testing (shared; Citation is frozen)."""
     return [
         Citation(
             chunk_id="chunk1",
             doc_id="doc123",
-            text="This is a homeowners insurance policy. Coverage A: Dwelling - $500,000.",
-            score=0.95,
-            metadata={"page_num": 1, "form_number": "HO-3"},
+            page_no=1,
+            quote="This is a homeowners insurance policy. Coverage A: Dwelling - $500,000.",
+            reason="States the dwelling coverage limit",
         ),
         Citation(
             chunk_id="chunk3",
             doc_id="doc123",
-            text="Section I - Exclusions. We do not cover water damage caused by flood or surface water.",
-            score=0.87,
-            metadata={"page_num": 2, "form_number": "HO-3"},
+            page_no=2,
+            quote="Section I - Exclusions. We do not cover water damage caused by flood or surface water.",
+            reason="States the water damage exclusion",
         ),
     ]
 
 
+@pytest.fixture(scope="session")
+def make_citations():
+    """Factory for numbered citations, memoized by count and doc_id."""
+    cache: dict[tuple[int, str], list[Citation]] = {}
+
+    def _make(n: int, doc_id: str = "doc123") -> list[Citation]:
+        key = (n, doc_id)
+        if key not in cache:
+            cache[key] = [
+                Citation(
+                    chunk_id=f"chunk{i}",
+                    doc_id=doc_id,
+                    page_no=1,
+                    quote=f"Text {i}",
+                    reason=f"Supports claim {i}",
+                )
+                for i in range(1, n + 1)
+            ]
+        return cache[key]
+
+    return _make
+
+
 # === Mock Adapter Fixtures ===
 
+def const_coro(value):
+    """Return a coroutine function that always resolves to ``value``.
+
+    Cheaper than ``AsyncMock.return_value`` since no call is recorded; keep
+    ``AsyncMock`` where a test asserts on ``called``/``call_args``.
+    """
+    async def _const(*args, **kwargs):
+        return value
+    return _const
+
+
 @pytest.fixture
 def mock_llm_adapter() -> AsyncMock:
     """Create a mock LLM adapter."""
@@ -275,76 +442,112 @@ def mock_graph_store() -> AsyncMock:
     return mock
 
 
-# === Configuration Fixtures ===
+# === Judge Check Fixtures ===
+#
+# Checks take their threshold per evaluate() call, not at construction.
+
+@pytest.fixture(scope="session")
+def citation_check() -> CitationCoverageCheck:
+    """Create a CitationCoverageCheck (stateless, shared by the session)."""
+    return CitationCoverageCheck()
+
 
 @pytest.fixture
+def groundedness_check(mock_llm_adapter: AsyncMock) -> GroundednessCheck:
+    """Create a GroundednessCheck bound to this test's mock LLM."""
+    return GroundednessCheck(mock_llm_adapter)
+
+
+@pytest.fixture
+def hallucination_check(mock_llm_adapter: AsyncMock) -> HallucinationCheck:
+    """Create a HallucinationCheck bound to this test's mock LLM."""
+    return HallucinationCheck(mock_llm_adapter)
+
+
+# === Configuration Fixtures ===
+#
+# Sample configs are plain constants; import them directly where possible.
+# They are shared across tests, so copy before mutating.
+
+SAMPLE_CHUNKING_CONFIG: dict = {
+    "method": "sentence_aware",
+    "chunk_size": 500,
+    "chunk_overlap": 50,
+    "sentence_min_length": 10,
+}
+
+SAMPLE_RETRIEVAL_CONFIG: dict = {
+    "vector_weight": 0.5,
+    "document_weight": 0.3,
+    "graph_weight": 0.2,
+    "vector_top_k": 10,
+    "document_top_k": 10,
+    "graph_top_k": 5,
+    "graph_strategy": "entity_search",
+}
+
+SAMPLE_FUSION_CONFIG: dict = {
+    "method": "weighted_rrf",
+    "rrf_k": 60,
+    "dedup_threshold": 0.9,
+    "max_results": 20,
+}
+
+SAMPLE_CONTEXT_CONFIG: dict = {
+    "max_tokens": 3000,
+    "citation_format": "numbered",
+    "include_metadata": True,
+    "redact_pii": True,
+}
+
+SAMPLE_JUDGE_CONFIG: dict = {
+    "checks": [
+        "citation_coverage",
+        "groundedness",
+        "hallucination",
+        "relevance",
+        "consistency",
+        "toxicity",
+        "pii",
+        "bias",
+        "contradiction",
+    ],
+    "citation_coverage_threshold": 0.9,
+    "groundedness_threshold": 0.8,
+    "hallucination_threshold": 0.1,
+    "relevance_threshold": 0.7,
+    "fail_on_violation": ["hallucination", "toxicity", "pii"],
+}
+
+
+@pytest.fixture(scope="session")
 def sample_chunking_config() -> dict:
     """Sample chunking configuration."""
-    return {
-        "method": "sentence_aware",
-        "chunk_size": 500,
-        "chunk_overlap": 50,
-        "sentence_min_length": 10,
-    }
+    return SAMPLE_CHUNKING_CONFIG
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_retrieval_config() -> dict:
     """Sample retrieval configuration."""
-    return {
-        "vector_weight": 0.5,
-        "document_weight": 0.3,
-        "graph_weight": 0.2,
-        "vector_top_k": 10,
-        "document_top_k": 10,
-        "graph_top_k": 5,
-        "graph_strategy": "entity_search",
-    }
+    return SAMPLE_RETRIEVAL_CONFIG
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_fusion_config() -> dict:
     """Sample fusion configuration."""
-    return {
-        "method": "weighted_rrf",
-        "rrf_k": 60,
-        "dedup_threshold": 0.9,
-        "max_results": 20,
-    }
+    return SAMPLE_FUSION_CONFIG
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_context_config() -> dict:
     """Sample context configuration."""
-    return {
-        "max_tokens": 3000,
-        "citation_format": "numbered",
-        "include_metadata": True,
-        "redact_pii": True,
-    }
+    return SAMPLE_CONTEXT_CONFIG
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_judge_config() -> dict:
     """Sample judge configuration."""
-    return {
-        "checks": [
-            "citation_coverage",
-            "groundedness",
-            "hallucination",
-            "relevance",
-            "consistency",
-            "toxicity",
-            "pii",
-            "bias",
-            "contradiction",
-        ],
-        "citation_coverage_threshold": 0.9,
-        "groundedness_threshold": 0.8,
-        "hallucination_threshold": 0.1,
-        "relevance_threshold": 0.7,
-        "fail_on_violation": ["hallucination", "toxicity", "pii"],
-    }
+    return SAMPLE_JUDGE_CONFIG
 
 
 @pytest.fixture
@@ -358,5 +561,7 @@ def openai_api_key() -> str:
 @pytest.fixture
 def test_client() -> TestClient:
     """Create a FastAPI test client."""
-    from app.main import app
-    return TestClient(app)
+    if _app_main is None:
+        from app.main import app
+        return TestClient(app)
+    return TestClient(_app_main.app)
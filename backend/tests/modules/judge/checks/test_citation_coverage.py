@@ -4,296 +4,134 @@ Unit tests for Citation Coverage check
 
 import pytest
 
-from app.core.models import Answer, Citation
+from app.core.models import Citation
 from app.modules.judge.checks.citation_coverage import CitationCoverageCheck
 
 
+async def _evaluate(
+    check: CitationCoverageCheck,
+    answer: str,
+    citations: list[Citation],
+    threshold: float = 0.9,
+) -> dict:
+    return await check.evaluate(
+        query="What does the policy cover?",
+        context="",
+        answer=answer,
+        citations=citations,
+        threshold=threshold,
+    )
+
+
 @pytest.mark.unit
 class TestCitationCoverageCheck:
     """Test cases for Citation Coverage check."""
 
     @pytest.fixture
-    def check(self) -> CitationCoverageCheck:
+    def check(self, citation_check: CitationCoverageCheck) -> CitationCoverageCheck:
         """Create a CitationCoverageCheck instance."""
-        config = {"threshold": 0.9}
-        return CitationCoverageCheck(config=config)
-
-    @pytest.fixture
-    def sample_answer_with_citations(
-        self, sample_citations: list[Citation]
-    ) -> Answer:
-        """Create a sample answer with proper citations."""
-        return Answer(
-            answer_text="The policy provides Coverage A for dwelling [1] and excludes water damage [2].",
-            citations=sample_citations,
-            confidence="high",
-            assumptions=[],
-            limitations=[],
-        )
-
-    @pytest.fixture
-    def sample_answer_missing_citations(self) -> Answer:
-        """Create an answer referencing non-existent citations."""
-        return Answer(
-            answer_text="The policy covers dwelling [1], personal property [2], and liability [3].",
-            citations=[
-                Citation(
-                    chunk_id="chunk1",
-                    doc_id="doc123",
-                    text="Coverage A: Dwelling - $500,000",
-                    score=0.95,
-                    metadata={},
-                )
-            ],  # Only 1 citation but answer references [1], [2], [3]
-            confidence="medium",
-            assumptions=[],
-            limitations=[],
-        )
-
-    @pytest.mark.asyncio
-    async def test_all_citations_present(
-        self,
-        check: CitationCoverageCheck,
-        sample_answer_with_citations: Answer,
-    ):
-        """Test when all cited references exist."""
-        result = await check.validate(
-            query="What does the policy cover?",
-            answer=sample_answer_with_citations,
-        )
-
-        assert result.passed is True
-        assert result.score >= 0.9
-        assert len(result.details.get("missing_citations", [])) == 0
+        return citation_check
 
     @pytest.mark.asyncio
-    async def test_missing_citations(
-        self,
-        check: CitationCoverageCheck,
-        sample_answer_missing_citations: Answer,
+    async def test_all_sentences_cited(
+        self, check: CitationCoverageCheck, sample_citations: list[Citation]
     ):
-        """Test when some citations are missing."""
-        result = await check.validate(
-            query="What does the policy cover?",
-            answer=sample_answer_missing_citations,
+        """Test every sentence carrying a citation."""
+        result = await _evaluate(
+            check,
+            "The policy provides Coverage A for dwelling [1]. It excludes water damage [2].",
+            sample_citations,
         )
 
-        assert result.passed is False
-        assert result.score < 0.9
-        assert len(result.details.get("missing_citations", [])) > 0
-        # Should identify [2] and [3] as missing
-        missing = result.details["missing_citations"]
-        assert "2" in missing or 2 in missing
-        assert "3" in missing or 3 in missing
+        assert result["score"] == 1.0
+        assert result["details"] == {
+            "total_sentences": 2,
+            "cited_sentences": 2,
+            "unique_citations": 2,
+        }
 
     @pytest.mark.asyncio
     async def test_no_citations_in_text(
         self, check: CitationCoverageCheck, sample_citations: list[Citation]
     ):
         """Test answer with no citation references in text."""
-        answer = Answer(
-            answer_text="The policy provides dwelling coverage and excludes water damage.",
-            citations=sample_citations,
-            confidence="high",
-            assumptions=[],
-            limitations=[],
-        )
-
-        result = await check.validate(
-            query="What does the policy cover?",
-            answer=answer,
+        result = await _evaluate(
+            check,
+            "The policy provides dwelling coverage and excludes water damage.",
+            sample_citations,
         )
 
-        # No citations referenced in text, but citations provided
-        # This should pass as there are no missing references
-        assert result.passed is True
+        assert result["score"] == 0.0
+        assert result["details"]["cited_sentences"] == 0
 
     @pytest.mark.asyncio
-    async def test_empty_citations_list(
-        self, check: CitationCoverageCheck
-    ):
-        """Test answer with citation references but no citations provided."""
-        answer = Answer(
-            answer_text="The policy covers dwelling [1] and personal property [2].",
-            citations=[],
-            confidence="medium",
-            assumptions=[],
-            limitations=[],
-        )
-
-        result = await check.validate(
-            query="What does the policy cover?",
-            answer=answer,
-        )
+    async def test_empty_answer(self, check: CitationCoverageCheck):
+        """Test an answer with no sentences scores zero rather than dividing by zero."""
+        result = await _evaluate(check, "", [])
 
-        assert result.passed is False
-        assert result.score == 0.0
-        assert len(result.details.get("missing_citations", [])) == 2
+        assert result["score"] == 0.0
+        assert result["details"]["total_sentences"] == 0
 
     @pytest.mark.asyncio
-    async def test_multiple_citation_formats(
-        self, check: CitationCoverageCheck, sample_citations: list[Citation]
-    ):
-        """Test different citation reference formats."""
-        answer = Answer(
-            answer_text="Coverage [1], exclusion [2], and additional info (see citation 1).",
-            citations=sample_citations,
-            confidence="high",
-            assumptions=[],
-            limitations=[],
-        )
-
-        result = await check.validate(
-            query="What is covered?",
-            answer=answer,
+    async def test_partial_coverage(self, check: CitationCoverageCheck, make_citations):
+        """Test partial citation coverage."""
+        result = await _evaluate(
+            check,
+            "Coverage A is $500,000 [1]. Coverage B is $50,000 [2]. "
+            "Coverage C is $250,000. Liability is $300,000.",
+            make_citations(2),
         )
 
-        # Should handle [1], [2] format
-        assert result.passed is True
+        # 2 of 4 sentences cited = 50% coverage
+        assert result["score"] == 0.5
+        assert "2/4" in result["message"]
 
     @pytest.mark.asyncio
-    async def test_threshold_configuration(
-        self, sample_answer_missing_citations: Answer
+    async def test_duplicate_citation_references(
+        self, check: CitationCoverageCheck, sample_citations: list[Citation]
     ):
-        """Test that threshold affects pass/fail decision."""
-        # Strict threshold
-        strict_check = CitationCoverageCheck(config={"threshold": 0.95})
-        result = await strict_check.validate(
-            query="Test", answer=sample_answer_missing_citations
+        """Test handling duplicate citation references."""
+        result = await _evaluate(
+            check,
+            "Coverage [1] is important. See [1] for details. Also [2].",
+            sample_citations,
         )
-        assert result.passed is False
 
-        # Lenient threshold
-        lenient_check = CitationCoverageCheck(config={"threshold": 0.3})
-        result = await lenient_check.validate(
-            query="Test", answer=sample_answer_missing_citations
-        )
-        # Might pass with lenient threshold depending on coverage ratio
-        # Score should be the same, only pass/fail changes
-        assert result.score < 1.0
+        assert result["score"] == 1.0
+        assert result["details"]["unique_citations"] == 2
 
     @pytest.mark.asyncio
-    async def test_citation_numbering_gaps(
-        self, check: CitationCoverageCheck
-    ):
+    async def test_citation_numbering_gaps(self, check: CitationCoverageCheck, make_citations):
         """Test handling of non-sequential citation numbers."""
-        citations = [
-            Citation(
-                chunk_id="chunk1",
-                doc_id="doc123",
-                text="Text 1",
-                score=0.9,
-                metadata={},
-            ),
-            Citation(
-                chunk_id="chunk5",
-                doc_id="doc123",
-                text="Text 5",
-                score=0.85,
-                metadata={},
-            ),
-        ]
-
-        answer = Answer(
-            answer_text="Coverage [1] and exclusion [5].",
-            citations=citations,
-            confidence="high",
-            assumptions=[],
-            limitations=[],
+        result = await _evaluate(
+            check, "Coverage applies [1]. Water damage is excluded [5].", make_citations(2)
         )
 
-        result = await check.validate(
-            query="Test",
-            answer=answer,
-        )
-
-        # Should correctly match [1] to first citation and [5] to second
-        assert result.passed is True
+        assert result["score"] == 1.0
+        assert result["details"]["unique_citations"] == 2
 
     @pytest.mark.asyncio
-    async def test_duplicate_citation_references(
+    async def test_non_bracket_reference_not_counted(
         self, check: CitationCoverageCheck, sample_citations: list[Citation]
     ):
-        """Test handling duplicate citation references."""
-        answer = Answer(
-            answer_text="Coverage [1] is important. See [1] for details. Also [2].",
-            citations=sample_citations,
-            confidence="high",
-            assumptions=[],
-            limitations=[],
-        )
-
-        result = await check.validate(
-            query="Test",
-            answer=answer,
+        """Test only [n] markers count as citations."""
+        result = await _evaluate(
+            check,
+            "Coverage applies [1]. Additional info is in citation 1.",
+            sample_citations,
         )
 
-        # Duplicate references to [1] should be fine
-        assert result.passed is True
+        assert result["score"] == 0.5
 
     @pytest.mark.asyncio
-    async def test_high_coverage_score(self, check: CitationCoverageCheck):
-        """Test perfect citation coverage."""
-        citations = [
-            Citation(
-                chunk_id=f"chunk{i}",
-                doc_id="doc123",
-                text=f"Text {i}",
-                score=0.9,
-                metadata={},
-            )
-            for i in range(1, 6)
-        ]
-
-        answer = Answer(
-            answer_text="Info [1], [2], [3], [4], and [5].",
-            citations=citations,
-            confidence="high",
-            assumptions=[],
-            limitations=[],
-        )
-
-        result = await check.validate(
-            query="Test",
-            answer=answer,
-        )
-
-        assert result.passed is True
-        assert result.score == 1.0
-
-    @pytest.mark.asyncio
-    async def test_partial_coverage(self, check: CitationCoverageCheck):
-        """Test partial citation coverage."""
-        citations = [
-            Citation(
-                chunk_id="chunk1",
-                doc_id="doc123",
-                text="Text 1",
-                score=0.9,
-                metadata={},
-            ),
-            Citation(
-                chunk_id="chunk2",
-                doc_id="doc123",
-                text="Text 2",
-                score=0.85,
-                metadata={},
-            ),
-        ]
-
-        answer = Answer(
-            answer_text="Coverage [1], [2], [3], and [4].",
-            citations=citations,
-            confidence="medium",
-            assumptions=[],
-            limitations=[],
-        )
+    async def test_threshold_not_applied_by_check(
+        self, check: CitationCoverageCheck, make_citations
+    ):
+        """Test the score is independent of the threshold (the orchestrator applies it)."""
+        answer = "Coverage [1]. Exclusions. Conditions [2]. Definitions."
 
-        result = await check.validate(
-            query="Test",
-            answer=answer,
-        )
+        strict = await _evaluate(check, answer, make_citations(2), threshold=0.95)
+        lenient = await _evaluate(check, answer, make_citations(2), threshold=0.3)
 
-        # 2 out of 4 citations present = 50% coverage
-        assert result.score == 0.5
-        assert result.passed is False  # Below 0.9 threshold
+        assert strict == lenient
+        assert strict["score"] == 0.5
@@ -0,0 +1,159 @@
+"""
+Unit tests for chunking module
+"""
+
+import re
+
+import pytest
+
+from app.core.models import ChunkingProfile, Document, Page
+from app.modules.chunking import ChunkingModule, shutdown_chunking_pool
+
+_CHUNK_ID_RE = re.compile(r"^doc123_p(\d+)_c[0-9a-f]{8}$")
+
+# Single-spaced sentences, so sentence chunks are exact substrings of the page
+_SENTENCES = [
+    f"Sentence {i} describes coverage limits for the dwelling and other structures."
+    for i in range(1, 41)
+]
+
+
+def _sample_document(texts: list) -> Document:
+    """Document with one page per text."""
+    return Document(
+        doc_id="doc123",
+        filename="sample.pdf",
+        pages=[
+            Page(page_no=i, text=text, char_count=len(text))
+            for i, text in enumerate(texts, start=1)
+        ],
+        metadata={"doc_type": "policy", "form_number": "HO-3", "state": "CA"},
+    )
+
+
+def _without_ids(chunks: list) -> list:
+    """Chunk fields minus the random chunk_id suffix."""
+    return [chunk.model_dump(exclude={"chunk_id"}) for chunk in chunks]
+
+
+@pytest.mark.unit
+class TestChunkingModule:
+    """Test cases for ChunkingModule."""
+
+    @pytest.fixture
+    def chunking(self) -> ChunkingModule:
+        """Create a ChunkingModule instance for testing."""
+        return ChunkingModule()
+
+    @pytest.fixture
+    def document(self) -> Document:
+        """Two pages of sentence text."""
+        return _sample_document([" ".join(_SENTENCES[:25]), " ".join(_SENTENCES[25:])])
+
+    def test_character_chunks_match_page_offsets(
+        self, chunking: ChunkingModule, document: Document
+    ):
+        """Test character chunks are the page slices their offsets name."""
+        profile = ChunkingProfile(chunk_size=300, chunk_overlap=50, sentence_aware=False)
+
+        chunks = chunking.chunk_document_sync(document, profile)
+
+        pages = {page.page_no: page.text for page in document.pages}
+        for chunk in chunks:
+            assert chunk.text == pages[chunk.page_no][chunk.char_start:chunk.char_end]
+            assert len(chunk.text) <= 300
+
+        page1 = [chunk for chunk in chunks if chunk.page_no == 1]
+        assert [chunk.char_start for chunk in page1] == list(range(0, len(pages[1]), 250))
+        assert page1[-1].char_end == len(pages[1])
+
+    def test_character_chunks_overlap(self, chunking: ChunkingModule, document: Document):
+        """Test consecutive character chunks share chunk_overlap characters."""
+        profile = ChunkingProfile(chunk_size=300, chunk_overlap=50, sentence_aware=False)
+
+        chunks = [
+            chunk for chunk in chunking.chunk_document_sync(document, profile)
+            if chunk.page_no == 1
+        ]
+
+        for prev, cur in zip(chunks, chunks[1:]):
+            assert prev.char_end - cur.char_start == 50
+            assert prev.text[-50:] == cur.text[:50]
+
+    def test_sentence_chunks_match_page_offsets(
+        self, chunking: ChunkingModule, document: Document
+    ):
+        """Test sentence chunks are the page slices their offsets name."""
+        profile = ChunkingProfile(chunk_size=400, chunk_overlap=80, sentence_aware=True)
+
+        chunks = chunking.chunk_document_sync(document, profile)
+
+        pages = {page.page_no: page.text for page in document.pages}
+        assert len(chunks) > 2
+        for chunk in chunks:
+            assert chunk.text == pages[chunk.page_no][chunk.char_start:chunk.char_end]
+
+    def test_sentence_chunks_overlap(self, chunking: ChunkingModule, document: Document):
+        """Test each sentence chunk opens with the previous chunk's tail."""
+        profile = ChunkingProfile(chunk_size=400, chunk_overlap=80, sentence_aware=True)
+
+        chunks = [
+            chunk for chunk in chunking.chunk_document_sync(document, profile)
+            if chunk.page_no == 1
+        ]
+
+        assert len(chunks) > 1
+        assert chunks[0].char_start == 0
+        for prev, cur in zip(chunks, chunks[1:]):
+            assert cur.text.startswith(prev.text[-80:] + " ")
+            assert cur.char_start == prev.char_end - 80
+
+    def test_chunk_ids_and_metadata(self, chunking: ChunkingModule, document: Document):
+        """Test chunk ids carry doc and page, are unique, and metadata propagates."""
+        profile = ChunkingProfile(chunk_size=200, chunk_overlap=20, sentence_aware=False)
+
+        chunks = chunking.chunk_document_sync(document, profile)
+
+        ids = [chunk.chunk_id for chunk in chunks]
+        assert len(set(ids)) == len(ids)
+        for chunk in chunks:
+            match = _CHUNK_ID_RE.match(chunk.chunk_id)
+            assert match is not None
+            assert int(match.group(1)) == chunk.page_no
+            assert chunk.tokens > 0
+            assert chunk.metadata == {"doc_type": "policy", "form_number": "HO-3", "state": "CA"}
+
+    def test_max_chunks_per_doc(self, chunking: ChunkingModule, document: Document):
+        """Test the profile's chunk limit truncates the result."""
+        profile = ChunkingProfile(
+            chunk_size=200, chunk_overlap=20, sentence_aware=False, max_chunks_per_doc=3
+        )
+
+        assert len(chunking.chunk_document_sync(document, profile)) == 3
+
+    def test_overlap_not_less_than_size_rejected(self, chunking: ChunkingModule):
+        """Test overlap >= size is rejected instead of chunking per character."""
+        with pytest.raises(ValueError):
+            ChunkingProfile(chunk_size=200, chunk_overlap=200)
+
+        with pytest.raises(ValueError, match="chunk_overlap"):
+            chunking._chunk_by_characters("x" * 1000, chunk_size=100, chunk_overlap=100)
+
+    @pytest.mark.asyncio
+    async def test_chunk_document_matches_sync(
+        self, chunking: ChunkingModule, document: Document
+    ):
+        """Test the worker-process path returns what the blocking path does."""
+        try:
+            for sentence_aware in (True, False):
+                profile = ChunkingProfile(
+                    chunk_size=300, chunk_overlap=60, sentence_aware=sentence_aware
+                )
+
+                chunks = await chunking.chunk_document(document, profile)
+
+                assert _without_ids(chunks) == _without_ids(
+                    chunking.chunk_document_sync(document, profile)
+                )
+        finally:
+            shutdown_chunking_pool()
@@ -8,6 +8,7 @@ import pytest
 
 from app.core.models import Chunk, Document, EntityType, Page
 from app.modules.indexing import Indexing
+from tests.conftest import SAMPLE_CHUNKING_CONFIG
 
 
 @pytest.mark.unit
@@ -34,8 +35,7 @@ class TestIndexing:
     async def test_index_document_success(
         self,
         indexing: Indexing,
-        sample_document: Document,
-        sample_chunking_config: dict,
+        sample_document_full: Document,
         mock_doc_store: AsyncMock,
         mock_vector_store: AsyncMock,
         mock_graph_store: AsyncMock,
@@ -43,12 +43,12 @@ class TestIndexing:
     ):
         """Test successful document indexing."""
         # Mock document retrieval
-        mock_doc_store.get_document.return_value = sample_document
+        mock_doc_store.get_document.return_value = sample_document_full
 
         # Index the document
         result = await indexing.index_document(
-            doc_id=sample_document.doc_id,
-            chunking_profile=sample_chunking_config,
+            doc_id=sample_document_full.doc_id,
+            chunking_profile=SAMPLE_CHUNKING_CONFIG,
         )
 
         # Verify chunks were created
@@ -57,19 +57,19 @@ class TestIndexing:
         assert result["chunks_created"] > 0
 
         # Verify all storage operations were called
-        mock_doc_store.save_chunks.assert_called_once()
-        mock_vector_store.add_vectors.assert_called_once()
+        assert mock_doc_store.save_chunks.call_count == 1
+        assert mock_vector_store.add_vectors.call_count == 1
         mock_graph_store.add_nodes.assert_called()
 
     @pytest.mark.asyncio
     async def test_chunk_creation_sentence_aware(
         self,
         indexing: Indexing,
-        sample_document: Document,
+        sample_document_full: Document,
         mock_doc_store: AsyncMock,
     ):
         """Test sentence-aware chunking."""
-        mock_doc_store.get_document.return_value = sample_document
+        mock_doc_store.get_document.return_value = sample_document_full
 
         config = {
             "method": "sentence_aware",
@@ -79,7 +79,7 @@ class TestIndexing:
         }
 
         result = await indexing.index_document(
-            doc_id=sample_document.doc_id,
+            doc_id=sample_document_full.doc_id,
             chunking_profile=config,
         )
 
@@ -93,19 +93,19 @@ class TestIndexing:
         # Verify chunk properties
         for chunk in chunks:
             assert isinstance(chunk, Chunk)
-            assert chunk.doc_id == sample_document.doc_id
+            assert chunk.doc_id == sample_document_full.doc_id
             assert len(chunk.text) <= config["chunk_size"] * 1.5  # Allow some flexibility
-            assert chunk.chunk_id.startswith(sample_document.doc_id)
+            assert chunk.chunk_id.startswith(sample_document_full.doc_id)
 
     @pytest.mark.asyncio
     async def test_chunk_creation_fixed_size(
         self,
         indexing: Indexing,
-        sample_document: Document,
+        sample_document_full: Document,
         mock_doc_store: AsyncMock,
     ):
         """Test fixed-size chunking."""
-        mock_doc_store.get_document.return_value = sample_document
+        mock_doc_store.get_document.return_value = sample_document_full
 
         config = {
             "method": "fixed_size",
@@ -114,7 +114,7 @@ class TestIndexing:
         }
 
         result = await indexing.index_document(
-            doc_id=sample_document.doc_id,
+            doc_id=sample_document_full.doc_id,
             chunking_profile=config,
         )
 
@@ -130,16 +130,15 @@ class TestIndexing:
     async def test_chunk_metadata_propagation(
         self,
         indexing: Indexing,
-        sample_document: Document,
-        sample_chunking_config: dict,
+        sample_document_full: Document,
         mock_doc_store: AsyncMock,
     ):
         """Test that document metadata is propagated to chunks."""
-        mock_doc_store.get_document.return_value = sample_document
+        mock_doc_store.get_document.return_value = sample_document_full
 
         await indexing.index_document(
-            doc_id=sample_document.doc_id,
-            chunking_profile=sample_chunking_config,
+            doc_id=sample_document_full.doc_id,
+            chunking_profile=SAMPLE_CHUNKING_CONFIG,
         )
 
         call_args = mock_doc_store.save_chunks.call_args
@@ -156,30 +155,30 @@ class TestIndexing:
     async def test_vector_embedding(
         self,
         indexing: Indexing,
-        sample_document: Document,
-        sample_chunking_config: dict,
+        sample_document_full: Document,
         mock_doc_store: AsyncMock,
         mock_llm_adapter: AsyncMock,
         mock_vector_store: AsyncMock,
     ):
         """Test that chunks are embedded and stored."""
-        mock_doc_store.get_document.return_value = sample_document
+        mock_doc_store.get_document.return_value = sample_document_full
 
         await indexing.index_document(
-            doc_id=sample_document.doc_id,
-            chunking_profile=sample_chunking_config,
+            doc_id=sample_document_full.doc_id,
+            chunking_profile=SAMPLE_CHUNKING_CONFIG,
         )
 
         # Verify embeddings were created
-        # LLM adapter should have been called for each chunk
-        assert mock_llm_adapter.embed.call_count > 0
+        # All chunk texts should go to the LLM adapter in a single batch
+        assert mock_llm_adapter.embed.call_count == 1
 
         # Verify vectors were added to vector store
-        mock_vector_store.add_vectors.assert_called_once()
+        assert mock_vector_store.add_vectors.call_count == 1
         call_args = mock_vector_store.add_vectors.call_args
         vectors = call_args[0][0]
 
         assert len(vectors) > 0
+        assert len(mock_llm_adapter.embed.call_args[0][0]) == len(vectors)
         assert all("chunk_id" in v for v in vectors)
         assert all("vector" in v for v in vectors)
 
@@ -187,18 +186,17 @@ class TestIndexing:
     async def test_entity_extraction(
         self,
         indexing: Indexing,
-        sample_document: Document,
-        sample_chunking_config: dict,
+        sample_document_full: Document,
         mock_doc_store: AsyncMock,
         mock_llm_adapter: AsyncMock,
         mock_graph_store: AsyncMock,
     ):
         """Test entity extraction from chunks."""
-        mock_doc_store.get_document.return_value = sample_document
+        mock_doc_store.get_document.return_value = sample_document_full
 
         await indexing.index_document(
-            doc_id=sample_document.doc_id,
-            chunking_profile=sample_chunking_config,
+            doc_id=sample_document_full.doc_id,
+            chunking_profile=SAMPLE_CHUNKING_CONFIG,
         )
 
         # Verify entity extraction was called
@@ -211,7 +209,6 @@ class TestIndexing:
     async def test_index_nonexistent_document(
         self,
         indexing: Indexing,
-        sample_chunking_config: dict,
         mock_doc_store: AsyncMock,
     ):
         """Test indexing a document that doesn't exist."""
@@ -220,18 +217,18 @@ class TestIndexing:
         with pytest.raises(ValueError, match="Document .* not found"):
             await indexing.index_document(
                 doc_id="nonexistent",
-                chunking_profile=sample_chunking_config,
+                chunking_profile=SAMPLE_CHUNKING_CONFIG,
             )
 
     @pytest.mark.asyncio
     async def test_chunk_overlap(
         self,
         indexing: Indexing,
-        sample_document: Document,
+        sample_document_full: Document,
         mock_doc_store: AsyncMock,
     ):
         """Test that chunk overlap works correctly."""
-        mock_doc_store.get_document.return_value = sample_document
+        mock_doc_store.get_document.return_value = sample_document_full
 
         config = {
             "method": "fixed_size",
@@ -240,7 +237,7 @@ class TestIndexing:
         }
 
         await indexing.index_document(
-            doc_id=sample_document.doc_id,
+            doc_id=sample_document_full.doc_id,
             chunking_profile=config,
         )
 
@@ -254,9 +251,10 @@ class TestIndexing:
             chunk1_end = chunks[0].text[-config["chunk_overlap"]:]
             chunk2_start = chunks[1].text[:config["chunk_overlap"]]
 
-            # At least some characters should overlap
+            # One of the last words of chunk 1 should reappear in chunk 2
+            # (substring search, done in C by str.__contains__)
             overlap_found = any(
-                char in chunk2_start for char in chunk1_end.split()[-2:]
+                token in chunk2_start for token in chunk1_end.split()[-2:]
             )
             assert overlap_found or len(chunks[0].text) < config["chunk_size"]
 
@@ -264,7 +262,6 @@ class TestIndexing:
     async def test_empty_document(
         self,
         indexing: Indexing,
-        sample_chunking_config: dict,
         mock_doc_store: AsyncMock,
     ):
         """Test indexing a document with no content."""
@@ -278,7 +275,7 @@ class TestIndexing:
 
         result = await indexing.index_document(
             doc_id="empty123",
-            chunking_profile=sample_chunking_config,
+            chunking_profile=SAMPLE_CHUNKING_CONFIG,
         )
 
         # Should handle gracefully with no chunks created
@@ -288,11 +285,11 @@ class TestIndexing:
     async def test_page_aware_chunking(
         self,
         indexing: Indexing,
-        sample_document: Document,
+        sample_document_full: Document,
         mock_doc_store: AsyncMock,
     ):
         """Test that page information is preserved in chunks."""
-        mock_doc_store.get_document.return_value = sample_document
+        mock_doc_store.get_document.return_value = sample_document_full
 
         config = {
             "method": "page_based",
@@ -301,7 +298,7 @@ class TestIndexing:
         }
 
         await indexing.index_document(
-            doc_id=sample_document.doc_id,
+            doc_id=sample_document_full.doc_id,
             chunking_profile=config,
         )
 
@@ -318,7 +315,6 @@ class TestIndexing:
     async def test_concurrent_indexing(
         self,
         indexing: Indexing,
-        sample_chunking_config: dict,
         mock_doc_store: AsyncMock,
     ):
         """Test indexing multiple documents concurrently."""
@@ -354,7 +350,7 @@ class TestIndexing:
         tasks = [
             indexing.index_document(
                 doc_id=doc.doc_id,
-                chunking_profile=sample_chunking_config,
+                chunking_profile=SAMPLE_CHUNKING_CONFIG,
             )
             for doc in docs
         ]
@@ -3,13 +3,11 @@ End-to-end pipeline tests
 Tests the complete RAG pipeline from ingestion to answer generation
 """
 
-import tempfile
+from dataclasses import dataclass
 from io import BytesIO
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 
 from app.adapters.file_doc_store import FileDocStore
 from app.adapters.networkx_graph import NetworkXGraph
@@ -23,13 +21,39 @@ from app.modules.judge.orchestrator import JudgeOrchestrator
 from app.modules.retrieval import Retrieval
 
 
+@dataclass(frozen=True, slots=True)
+class FakeContextPack:
+    """Minimal stand-in for a compiled context pack passed to generation."""
+
+    context_text: str
+    citations: list
+    total_tokens: int
+
+
+# One immutable embedding shared by every fake embed call; a tuple so code
+# that mutates a returned embedding fails loudly instead of corrupting others
+_FAKE_EMBEDDING = (0.1,) * 1536
+
+
+def _fake_embed(texts):
+    """Embed a single text or a batch of texts as the shared constant vector."""
+    if isinstance(texts, str):
+        return _FAKE_EMBEDDING
+    return [_FAKE_EMBEDDING] * len(texts)
+
+
 @pytest.mark.integration
 class TestE2EPipeline:
     """End-to-end pipeline tests."""
 
-    @pytest.fixture
-    def sample_pdf_path(self) -> str:
-        """Create a temporary sample PDF file."""
+    @pytest.fixture(scope="session")
+    def sample_pdf_path(self, tmp_path_factory) -> str:
+        """Create a temporary sample PDF file, shared by the session."""
+        # Imported lazily: ReportLab is slow to import and only PDF-building
+        # tests need it
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+
         buffer = BytesIO()
         pdf = canvas.Canvas(buffer, pagesize=letter)
 
@@ -52,16 +76,12 @@ class TestE2EPipeline:
         pdf.showPage()
 
         pdf.save()
-        buffer.seek(0)
 
-        # Write to temp file
-        temp_file = tempfile.NamedTemporaryFile(
-            suffix=".pdf", delete=False
-        )
-        temp_file.write(buffer.read())
-        temp_file.close()
+        # Write under pytest's session temp dir, which pytest cleans up
+        path = tmp_path_factory.mktemp("pdfs") / "sample_policy.pdf"
+        path.write_bytes(buffer.getvalue())
 
-        return temp_file.name
+        return str(path)
 
     @pytest.fixture
     async def setup_pipeline(
@@ -70,6 +90,8 @@ class TestE2EPipeline:
         mock_llm_adapter: AsyncMock,
     ):
         """Set up the complete pipeline with real adapters."""
+        mock_llm_adapter.embed.side_effect = _fake_embed
+
         # Use real adapters for this E2E test
         doc_store = FileDocStore(data_dir=test_data_dir)
 
@@ -126,7 +148,6 @@ class TestE2EPipeline:
         pipeline = setup_pipeline
 
         # Mock LLM responses
-        mock_llm_adapter.embed.return_value = [0.1] * 1536
         mock_llm_adapter.extract_entities.return_value = {
             "nodes": [
                 {
@@ -185,7 +206,6 @@ class TestE2EPipeline:
 
         # Get chunks for mocking
         chunks = await pipeline["doc_store"].get_chunks(document.doc_id)
-        mock_llm_adapter.embed.return_value = [0.1] * 1536
 
         retrieval_results = await pipeline["retrieval"].retrieve(
             query="What does the policy cover and what is excluded?",
@@ -325,7 +345,7 @@ class TestE2EPipeline:
         with pytest.raises(Exception):
             answer = await pipeline["generation"].generate_answer(
                 query="Test query",
-                context_pack=MagicMock(
+                context_pack=FakeContextPack(
                     context_text="Test context",
                     citations=[],
                     total_tokens=100,
@@ -349,13 +369,20 @@ class TestE2EPipeline:
             metadata={},
         )
 
-        # Retrieve document (should be cached in doc store)
+        # Retrieve document; the first read loads it from disk
         doc2 = await pipeline["doc_store"].get_document(doc1.doc_id)
 
         assert doc2 is not None
         assert doc1.doc_id == doc2.doc_id
         assert len(doc1.pages) == len(doc2.pages)
 
+        # A repeat read is served from the doc store's cache without disk I/O
+        with patch("app.adapters.file_doc_store.aiofiles.open") as mock_open:
+            doc3 = await pipeline["doc_store"].get_document(doc1.doc_id)
+
+        mock_open.assert_not_called()
+        assert doc3 == doc2
+
     @pytest.mark.asyncio
     async def test_multi_document_query(
         self,
@@ -366,7 +393,6 @@ class TestE2EPipeline:
         """Test querying across multiple documents."""
         pipeline = setup_pipeline
 
-        mock_llm_adapter.embed.return_value = [0.1] * 1536
         mock_llm_adapter.extract_entities.return_value = {
             "nodes": [],
             "edges": [],
@@ -0,0 +1,109 @@
+"""
+Numba-compiled Fruchterman-Reingold layout kernel
+Drop-in for networkx's dense spring_layout, used by visualize_graph.py
+"""
+
+import numpy as np
+import networkx as nx
+
+# Optional dependency: without numba the kernel still runs as plain Python
+# (slowly), and NUMBA_AVAILABLE tells callers to prefer networkx instead
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# Same floors and convergence threshold as networkx's _fruchterman_reingold:
+# pairwise distances are clipped up to _MIN_DISTANCE, while a displacement
+# shorter than _MIN_DISTANCE is divided by _SHORT_DISPLACEMENT_LENGTH instead
+_MIN_DISTANCE = 0.01
+_SHORT_DISPLACEMENT_LENGTH = 0.1
+_THRESHOLD = 1e-4
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _fruchterman_reingold(pos, A, k, iterations, t, dt, threshold):
+    """Run the FR iterations in place on pos (float32[:, 2])"""
+    n = pos.shape[0]
+    displacement = np.zeros_like(pos)
+    for _ in range(iterations):
+        # Repulsion from every node plus attraction along edges, one row per
+        # node; rows are independent, so the outer loop runs in parallel
+        for i in prange(n):
+            dx_sum = 0.0
+            dy_sum = 0.0
+            for j in range(n):
+                dx = pos[i, 0] - pos[j, 0]
+                dy = pos[i, 1] - pos[j, 1]
+                # Manual sqrt of the squared sum vectorizes better than norm
+                distance = np.sqrt(dx * dx + dy * dy)
+                if distance < _MIN_DISTANCE:
+                    distance = _MIN_DISTANCE
+                force = k * k / (distance * distance) - A[i, j] * distance / k
+                dx_sum += dx * force
+                dy_sum += dy * force
+            displacement[i, 0] = dx_sum
+            displacement[i, 1] = dy_sum
+
+        # Move each node at most t along its displacement, then cool
+        step_sq = 0.0
+        for i in range(n):
+            length = np.sqrt(displacement[i, 0] ** 2 + displacement[i, 1] ** 2)
+            if length < _MIN_DISTANCE:
+                length = _SHORT_DISPLACEMENT_LENGTH
+            step_x = displacement[i, 0] * t / length
+            step_y = displacement[i, 1] * t / length
+            pos[i, 0] += step_x
+            pos[i, 1] += step_y
+            step_sq += step_x * step_x + step_y * step_y
+        t -= dt
+        if np.sqrt(step_sq) / n < threshold:
+            break
+    return pos
+
+
+def spring_layout(G, k=None, iterations=50, seed=None):
+    """
+    Spring layout matching nx.spring_layout's dense algorithm
+
+    Args:
+        G: networkx graph
+        k: Optimal distance between nodes (default 1/sqrt(N))
+        iterations: Maximum number of iterations
+        seed: Seed for the random initial positions
+
+    Returns:
+        Dict of node -> float32 (x, y), centered and scaled to [-1, 1]
+    """
+    nodes = list(G)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(2, dtype=np.float32)}
+
+    A = nx.to_numpy_array(G, nodelist=nodes, weight='weight', dtype=np.float32)
+    # Same initial positions networkx draws for a given seed
+    pos = np.random.RandomState(seed).rand(n, 2).astype(np.float32)
+    if k is None:
+        k = np.sqrt(1.0 / n)
+
+    # Initial temperature: a tenth of the starting layout's extent, cooled
+    # linearly so the last iteration moves almost nothing
+    t = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1])) * 0.1
+    dt = t / (iterations + 1)
+    pos = _fruchterman_reingold(pos, A, np.float32(k), iterations, np.float32(t), np.float32(dt), _THRESHOLD)
+
+    # Center on the origin and scale into [-1, 1], as nx.rescale_layout does
+    pos -= pos.mean(axis=0)
+    limit = np.abs(pos).max()
+    if limit > 0:
+        pos /= limit
+    return dict(zip(nodes, pos))
@@ -3,63 +3,287 @@ Graph Visualization Script
 Visualizes the entity graph created during indexing
 """
 
-import json
+import argparse
+import hashlib
+import mmap
+import numpy as np
+import orjson
+import os
+import re
+import sys
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from collections import defaultdict
+
+# Spring layout settings, and their encoding in layout cache keys
+_LAYOUT_PARAMS = {'k': 2, 'iterations': 50, 'seed': 42}
+_LAYOUT_PARAMS_KEY = repr(sorted(_LAYOUT_PARAMS.items())).encode()
+
+# Colors for different entity types, plus a palette array for vectorized lookup
+_COLOR_MAP = {
+    'Coverage': '#FF6B6B',
+    'Exclusion': '#4ECDC4',
+    'Condition': '#45B7D1',
+    'Endorsement': '#FFA07A',
+    'Form': '#98D8C8',
+    'Definition': '#F7DC6F',
+    'State': '#BB8FCE',
+    'Term': '#85C1E2',
+    'Other': '#95A5A6'
+}
+_PALETTE = np.array(list(_COLOR_MAP.values()))
+_TYPE_TO_PALETTE_IDX = {entity_type: i for i, entity_type in enumerate(_COLOR_MAP)}
+# Unknown types are drawn in the 'Other' color
+_OTHER_PALETTE_IDX = _TYPE_TO_PALETTE_IDX['Other']
+
+# Node marker area (points^2); markers are circles of diameter sqrt(area)
+_NODE_SIZE = 3000
+_NODE_RADIUS_PT = np.sqrt(_NODE_SIZE) / 2
+_ARROWHEAD_LENGTH_PT = 7.5
+
+# Small graphs get a closed-form circular layout; no optimizer needed
+_CIRCULAR_MAX_NODES = 20
+
+# Above this many nodes, spring_layout's O(N^2) repulsion dominates runtime,
+# so use Barnes-Hut ForceAtlas2 (O(N log N)) when fa2_modified is installed
+_FORCEATLAS2_MIN_NODES = 300
+
+try:
+    from fa2_modified import ForceAtlas2
+except ImportError:
+    ForceAtlas2 = None
+
+# Numba-compiled FR kernel for the spring layout; networkx's when numba is missing
+from layout_kernel import NUMBA_AVAILABLE, spring_layout as numba_spring_layout
+
+# Matches a whitespace-only (blank) JSONL line
+_BLANK_LINE_RE = re.compile(rb'\s*')
+
+def _read_jsonl(path: Path):
+    """Parse a JSONL file with orjson, straight from a read-only memory map"""
+    records = []
+    with open(path, 'rb') as f:
+        # mmap can't map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return records
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Lines are parsed from memoryview slices, without copying each
+            # one into its own bytes object
+            view = memoryview(mm)
+            try:
+                start = 0
+                end = len(mm)
+                while start < end:
+                    nl = mm.find(b"\n", start)
+                    if nl == -1:
+                        nl = end
+                    if not _BLANK_LINE_RE.fullmatch(mm, start, nl):
+                        records.append(orjson.loads(view[start:nl]))
+                    start = nl + 1
+            finally:
+                # Release the export so the map can close
+                view.release()
+    return records
+
+def _load_jsonl(path: Path):
+    """Records from a JSONL file, or an empty list if it doesn't exist"""
+    return _read_jsonl(path) if path.exists() else []
+
+def _intern_properties(records, pool):
+    """Make records with equal properties share one dict (treat as read-only)"""
+    for record in records:
+        properties = record.get('properties')
+        if not properties:
+            continue
+        try:
+            key = tuple(sorted(properties.items()))
+            record['properties'] = pool.setdefault(key, properties)
+        except TypeError:
+            # Nested lists/dicts aren't hashable; leave those unshared
+            pass
 
 def load_graph_data(graph_dir: Path):
     """Load nodes and edges from JSONL files"""
-    nodes = []
-    edges = []
-
-    # Load nodes
-    nodes_file = graph_dir / "nodes.jsonl"
-    if nodes_file.exists():
-        with open(nodes_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    nodes.append(json.loads(line))
-
-    # Load edges
-    edges_file = graph_dir / "edges.jsonl"
-    if edges_file.exists():
-        with open(edges_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    edges.append(json.loads(line))
+    # The two files are independent, so load them side by side; the disk
+    # reads (mmap page faults) overlap even though parsing holds the GIL
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        nodes_future = executor.submit(_load_jsonl, graph_dir / "nodes.jsonl")
+        edges_future = executor.submit(_load_jsonl, graph_dir / "edges.jsonl")
+        nodes, edges = nodes_future.result(), edges_future.result()
 
+    # Knowledge-graph records often repeat a few property shapes, so keep one
+    # copy of each
+    pool = {}
+    _intern_properties(nodes, pool)
+    _intern_properties(edges, pool)
     return nodes, edges
 
-def create_visualization(nodes, edges, output_file="graph_visualization.png"):
-    """Create and save graph visualization"""
+def _layout_method(G) -> str:
+    """Layout algorithm to use for G"""
+    if len(G) <= _CIRCULAR_MAX_NODES:
+        return 'circular'
+    if ForceAtlas2 is not None and len(G) > _FORCEATLAS2_MIN_NODES:
+        return 'forceatlas2'
+    if NUMBA_AVAILABLE:
+        return 'spring-numba'
+    return 'spring'
+
+def _run_layout(G, method: str):
+    """Compute node positions for G with the given algorithm"""
+    if method == 'forceatlas2':
+        forceatlas2 = ForceAtlas2(barnesHutOptimize=True, barnesHutTheta=1.2, verbose=False)
+        return forceatlas2.forceatlas2_networkx_layout(
+            G, pos=None, iterations=_LAYOUT_PARAMS['iterations']
+        )
+    if method == 'circular':
+        return nx.circular_layout(G)
+    if method == 'spring-numba':
+        return numba_spring_layout(G, **_LAYOUT_PARAMS)
+    return nx.spring_layout(G, **_LAYOUT_PARAMS)
+
+def _layout_cache_path(G, cache_dir: Path, method: str) -> Path:
+    """Cache file for G's layout, keyed by a hash of its node ids and edges"""
+    h = hashlib.blake2b()
+    # Layout algorithm and parameters are part of the key so changing them
+    # invalidates it
+    h.update(method.encode() + b"\0" + _LAYOUT_PARAMS_KEY)
+    for node_id in sorted(map(str, G.nodes())):
+        h.update(node_id.encode() + b"\0")
+    h.update(b"\1")
+    for source, target in sorted((str(u), str(v)) for u, v in G.edges()):
+        h.update(source.encode() + b"\0" + target.encode() + b"\0")
+    return cache_dir / f"layout_{h.hexdigest()[:16]}.npz"
+
+def compute_layout(G, cache_dir: Path = None):
+    """Layout for G, reused from cache_dir when the graph is unchanged"""
+    method = _layout_method(G)
+    if cache_dir is None:
+        return _run_layout(G, method)
+
+    # Stored in sorted id order, matching the cache key
+    ids = sorted(G.nodes(), key=str)
+    cache_path = _layout_cache_path(G, cache_dir, method)
+    if cache_path.exists():
+        with np.load(cache_path) as cached:
+            return dict(zip(ids, cached['pos']))
+
+    # One contiguous (N, 2) float32 array: half the size of float64 and still
+    # far finer than a pixel. ids are stored alongside so the file is
+    # self-describing
+    pos = _run_layout(G, method)
+    np.savez(
+        cache_path,
+        ids=np.array([str(node_id) for node_id in ids]),
+        pos=np.asarray([pos[node_id] for node_id in ids], dtype=np.float32).reshape(-1, 2)
+    )
+    return pos
+
+def _print_details(nodes, edges, id_to_label):
+    """Print every node and relationship with a single stdout write"""
+    lines = [f"\n{'='*60}", "NODE DETAILS", "="*60]
+    for node in nodes:
+        props = node.get('properties', {})
+        props_str = f" - {props}" if props else ""
+        lines.append(f"[{node['node_type']}] {node['label']}{props_str}")
+
+    lines += [f"\n{'='*60}", "RELATIONSHIP DETAILS", "="*60]
+    if edges:
+        for edge in edges:
+            source_label = id_to_label.get(edge['source'], edge['source'])
+            target_label = id_to_label.get(edge['target'], edge['target'])
+            edge_type = edge.get('edge_type', 'UNKNOWN')
+            lines.append(f"{source_label} --[{edge_type}]--> {target_label}")
+    else:
+        lines.append("No edges found in graph")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _draw_arrowheads(ax, sources, targets):
+    """Draw every edge's arrowhead, stopping at the target node's edge, in one quiver"""
+    if len(sources) == 0:
+        return
+
+    # Work in display space so the node radius (in points) and the direction
+    # are right whatever the axes' aspect ratio
+    to_display = ax.transData
+    src_px = to_display.transform(sources)
+    tgt_px = to_display.transform(targets)
+    vec_px = tgt_px - src_px
+    length_px = np.linalg.norm(vec_px, axis=1, keepdims=True)
+    # Self-loops have no direction to draw
+    keep = length_px[:, 0] > 0
+    unit_px = vec_px[keep] / length_px[keep]
+
+    radius_px = _NODE_RADIUS_PT * ax.figure.dpi / 72
+    heads = to_display.inverted().transform(tgt_px[keep] - unit_px * radius_px)
+
+    # pivot='tip' puts each arrow's point on the node boundary; angles='uv'
+    # reads the direction in screen space, matching unit_px
+    head_len_in = _ARROWHEAD_LENGTH_PT / 72
+    ax.quiver(
+        heads[:, 0], heads[:, 1],
+        unit_px[:, 0] * head_len_in, unit_px[:, 1] * head_len_in,
+        angles='uv', scale_units='inches', scale=1, units='inches',
+        width=1.5 / 72, headwidth=5, headlength=5, headaxislength=4.5,
+        pivot='tip', color='#7F8C8D', alpha=0.6, zorder=3
+    )
+
+def create_visualization(nodes, edges, output_file="graph_visualization.png", layout_cache_dir: Path = None, verbose=False, dpi=150):
+    """
+    Create and save graph visualization
+
+    Args:
+        nodes: Node records from nodes.jsonl
+        edges: Edge records from edges.jsonl
+        output_file: Path of the PNG to write
+        layout_cache_dir: Directory for cached layouts (no caching if None)
+        verbose: Also print every node and relationship
+        dpi: Output resolution; 150 gives a 2400x1800 PNG for the 16x12in figure
+    """
 
     # Create directed graph
     G = nx.DiGraph()
 
-    # Add nodes with attributes
-    for node in nodes:
-        G.add_node(
+    # Add nodes with attributes (one bulk call rather than add_node per node)
+    G.add_nodes_from(
+        (
             node['node_id'],
-            label=node['label'],
-            node_type=node['node_type'],
-            properties=node.get('properties', {})
+            {
+                'label': node['label'],
+                'node_type': node['node_type'],
+                'properties': node.get('properties', {})
+            }
         )
+        for node in nodes
+    )
 
     # Add edges with attributes
-    for edge in edges:
-        G.add_edge(
+    G.add_edges_from(
+        (
             edge['source'],
             edge['target'],
-            edge_type=edge.get('edge_type', 'UNKNOWN'),
-            properties=edge.get('properties', {})
+            {
+                'edge_type': edge.get('edge_type', 'UNKNOWN'),
+                'properties': edge.get('properties', {})
+            }
         )
+        for edge in edges
+    )
+
+    # Column arrays (SoA) of the node fields used below, so counting and color
+    # mapping run in NumPy rather than over per-record dict lookups
+    node_ids = np.array([node['node_id'] for node in nodes])
+    node_types = np.array([node['node_type'] for node in nodes])
 
     # Count entity types
-    entity_type_counts = defaultdict(int)
-    for node in nodes:
-        entity_type_counts[node['node_type']] += 1
+    unique_types, type_index, type_counts = np.unique(
+        node_types, return_inverse=True, return_counts=True
+    )
+    # Most common first, ordered straight from the np.unique counts
+    by_count = np.argsort(-type_counts, kind='stable')
+    entity_type_counts = dict(zip(unique_types[by_count].tolist(), type_counts[by_count].tolist()))
 
     # Print statistics
     print("\n" + "="*60)
@@ -68,77 +292,52 @@ def create_visualization(nodes, edges, output_file="graph_visualization.png"):
     print(f"Total Nodes: {len(nodes)}")
     print(f"Total Edges: {len(edges)}")
     print(f"\nEntity Type Distribution:")
-    for entity_type, count in sorted(entity_type_counts.items(), key=lambda x: x[1], reverse=True):
+    for entity_type, count in entity_type_counts.items():
         print(f"  {entity_type}: {count}")
 
-    # Print node details
-    print(f"\n{'='*60}")
-    print("NODE DETAILS")
-    print("="*60)
-    for node in nodes:
-        props = node.get('properties', {})
-        props_str = f" - {props}" if props else ""
-        print(f"[{node['node_type']}] {node['label']}{props_str}")
+    # Labels by node id, built once for both the detail listing and the
+    # drawing (an O(1) lookup per edge endpoint instead of a node scan)
+    labels = {node['node_id']: node['label'] for node in nodes}
 
-    # Print edge details
-    print(f"\n{'='*60}")
-    print("RELATIONSHIP DETAILS")
-    print("="*60)
-    if edges:
-        for edge in edges:
-            source_label = next((n['label'] for n in nodes if n['node_id'] == edge['source']), edge['source'])
-            target_label = next((n['label'] for n in nodes if n['node_id'] == edge['target']), edge['target'])
-            edge_type = edge.get('edge_type', 'UNKNOWN')
-            print(f"{source_label} --[{edge_type}]--> {target_label}")
-    else:
-        print("No edges found in graph")
+    if verbose:
+        _print_details(nodes, edges, labels)
 
     # Create visualization
     fig, ax = plt.subplots(figsize=(16, 12))
 
-    # Define colors for different entity types
-    color_map = {
-        'Coverage': '#FF6B6B',
-        'Exclusion': '#4ECDC4',
-        'Condition': '#45B7D1',
-        'Endorsement': '#FFA07A',
-        'Form': '#98D8C8',
-        'Definition': '#F7DC6F',
-        'State': '#BB8FCE',
-        'Term': '#85C1E2',
-        'Other': '#95A5A6'
-    }
-
-    # Get node colors based on type
-    node_colors = [color_map.get(G.nodes[node]['node_type'], '#95A5A6') for node in G.nodes()]
-
-    # Use spring layout for better spacing
-    pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-
-    # Draw nodes
-    nx.draw_networkx_nodes(
-        G, pos,
-        node_color=node_colors,
-        node_size=3000,
-        alpha=0.9,
-        ax=ax
+    # Get node colors based on type: resolve each distinct type to a palette
+    # index once, then gather every node's color through np.unique's inverse
+    type_palette_idx = np.array(
+        [_TYPE_TO_PALETTE_IDX.get(t, _OTHER_PALETTE_IDX) for t in unique_types.tolist()],
+        dtype=np.int32
     )
+    node_colors = _PALETTE[type_palette_idx[type_index]] if len(nodes) else []
 
-    # Draw edges
-    nx.draw_networkx_edges(
-        G, pos,
-        edge_color='#7F8C8D',
-        arrows=True,
-        arrowsize=20,
-        arrowstyle='->',
-        width=2,
+    # Force-directed layout for better spacing
+    pos = compute_layout(G, layout_cache_dir)
+
+    # Draw nodes as one scatter artist rather than per-node patches
+    node_xy = np.array([pos[node_id] for node_id in node_ids.tolist()], dtype=np.float32).reshape(-1, 2)
+    # Rasterized so vector outputs (PDF/SVG) stay small for large graphs
+    ax.scatter(node_xy[:, 0], node_xy[:, 1], c=node_colors, s=_NODE_SIZE, alpha=0.9, zorder=2, rasterized=True)
+
+    # Draw edges as a single LineCollection, beneath the nodes
+    segments = np.array(
+        [[pos[source], pos[target]] for source, target in G.edges()],
+        dtype=np.float32
+    ).reshape(-1, 2, 2)
+    sources, targets = segments[:, 0], segments[:, 1]
+    ax.add_collection(LineCollection(
+        segments,
+        colors='#7F8C8D',
+        linewidths=2,
         alpha=0.6,
-        ax=ax,
-        connectionstyle='arc3,rad=0.1'
-    )
+        zorder=1,
+        rasterized=True
+    ))
+    ax.autoscale_view()
 
     # Draw labels
-    labels = {node: G.nodes[node]['label'] for node in G.nodes()}
     nx.draw_networkx_labels(
         G, pos,
         labels,
@@ -148,7 +347,7 @@ def create_visualization(nodes, edges, output_file="graph_visualization.png"):
     )
 
     # Draw edge labels
-    edge_labels = {(e[0], e[1]): e[2].get('edge_type', '') for e in G.edges(data=True)}
+    edge_labels = {(e['source'], e['target']): e.get('edge_type', 'UNKNOWN') for e in edges}
     nx.draw_networkx_edge_labels(
         G, pos,
         edge_labels,
@@ -157,11 +356,13 @@ def create_visualization(nodes, edges, output_file="graph_visualization.png"):
     )
 
     # Create legend
+    # One entry per type present, in the same most-common-first order as the
+    # statistics; unknown types show in the 'Other' color they're drawn with
     legend_elements = [
         plt.Line2D([0], [0], marker='o', color='w',
-                   markerfacecolor=color, markersize=10, label=entity_type)
-        for entity_type, color in color_map.items()
-        if entity_type in entity_type_counts
+                   markerfacecolor=_COLOR_MAP.get(entity_type, _COLOR_MAP['Other']),
+                   markersize=10, label=entity_type)
+        for entity_type in entity_type_counts
     ]
     ax.legend(handles=legend_elements, loc='upper left', title='Entity Types')
 
@@ -169,7 +370,11 @@ def create_visualization(nodes, edges, output_file="graph_visualization.png"):
     ax.axis('off')
 
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    # After tight_layout, so the data-to-display transform is final
+    _draw_arrowheads(ax, sources, targets)
+
+    # Fast zlib level: PNG encoding, not layout, dominates at high resolutions
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight', pil_kwargs={'compress_level': 1})
     print(f"\n{'='*60}")
     print(f"Visualization saved to: {output_file}")
     print("="*60 + "\n")
@@ -177,6 +382,11 @@ def create_visualization(nodes, edges, output_file="graph_visualization.png"):
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Visualize the entity graph created during indexing")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="print every node and relationship")
+    args = parser.parse_args()
+
     graph_dir = Path("data/graph")
 
     if not graph_dir.exists():
@@ -190,7 +400,7 @@ def main():
         print("No nodes found in graph. Please run indexing first.")
         return
 
-    create_visualization(nodes, edges)
+    create_visualization(nodes, edges, layout_cache_dir=graph_dir, verbose=args.verbose)
 
 if __name__ == "__main__":
     main()